@@ -17,7 +17,7 @@
 import threading
 import time
 from collections import OrderedDict
-from typing import Any, List, Optional, Tuple
+from typing import Any, Callable, List, Optional, Tuple
 
 from src.common.logger import get_logger
 
@@ -160,6 +160,23 @@ class LRUCache:
         with self._lock:
             self.cache.clear()
 
+    def pop_where(self, predicate: Callable[[Any, Any], bool]) -> int:
+        """Remove every cached item for which predicate(key, value) is true (thread-safe).
+
+        Args:
+            predicate: Called with each key and its cached value
+
+        Returns:
+            Number of removed items
+
+        注意：在锁内遍历，predicate 应为不访问本缓存的轻量判断
+        """
+        with self._lock:
+            stale_keys = [key for key, (value, _) in self.cache.items() if predicate(key, value)]
+            for key in stale_keys:
+                del self.cache[key]
+            return len(stale_keys)
+
     def items(self) -> List[Tuple[Any, Any]]:
         """Return all cached key-value pairs (excluding expired).
 
@@ -2,7 +2,7 @@
 
 import json
 from typing import Dict, Any, List, Tuple
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from src.plugin_system import BaseCommand
 from src.common.logger import get_logger
@@ -10,11 +10,27 @@ from src.common.logger import get_logger
 from ..planner.goal_manager import get_goal_manager, GoalStatus
 from ..planner.schedule_generator import ScheduleGenerator, ScheduleType
 from ..utils.schedule_image_generator import ScheduleImageGenerator
-from ..utils.time_utils import format_minutes_to_time, get_time_window_from_goal
+from ..utils.time_utils import format_minutes_to_time, get_goal_time_window, get_time_window_from_goal
 from ..utils.timezone_manager import TimezoneManager
 
 logger = get_logger("autonomous_planning.commands")
 
+# 星期中文名（按 datetime.weekday() 索引）
+_WEEKDAY_CN = ("周一", "周二", "周三", "周四", "周五", "周六", "周日")
+
+# 目标类型 → emoji
+_GOAL_TYPE_EMOJI = {
+    "meal": "🍽️",
+    "study": "📚",
+    "entertainment": "🎮",
+    "daily_routine": "🏠",
+    "social_maintenance": "💬",
+    "learn_topic": "📖",
+    "exercise": "🏃",
+    "rest": "💤",
+    "free_time": "🌟",
+}
+
 class PlanningCommand(BaseCommand):
     """规划管理命令"""
 
@@ -30,6 +46,9 @@ class PlanningCommand(BaseCommand):
         # 初始化时区管理器
         timezone_str = self.get_config("autonomous_planning.schedule.timezone", "Asia/Shanghai")
         self.tz_manager = TimezoneManager(timezone_str)
+        # 管理员列表预先转为frozenset（O(1)成员判断，配置只读取一次）
+        admin_users = self.get_config("autonomous_planning.schedule.admin_users", []) or []
+        self._admin_set = frozenset(str(u) for u in admin_users)
 
     def _get_today_schedule_goals(self, goal_manager) -> List:
         """
@@ -54,8 +73,7 @@ class PlanningCommand(BaseCommand):
             排序后的日程目标列表
         """
         def get_time_window(g):
-            tw = (g.parameters.get("time_window") if g.parameters else None) or \
-                 (g.conditions.get("time_window") if g.conditions else None) or [0]
+            tw = get_goal_time_window(g)
             return tw[0] if tw else 0
 
         return sorted(goals, key=get_time_window)
@@ -68,16 +86,20 @@ class PlanningCommand(BaseCommand):
         """从目标中提取时间窗口（统一使用工具函数）"""
         return get_time_window_from_goal(goal)
 
+    def _get_today_label(self) -> str:
+        """获取今天的日期和星期标签（只读取一次当前时间），如 2025-01-01 周三"""
+        now = self.tz_manager.get_now()
+        return f"{now.strftime('%Y-%m-%d')} {_WEEKDAY_CN[now.weekday()]}"
+
     def _check_permission(self) -> bool:
         """检查用户权限"""
         try:
-            admin_users = self.get_config("autonomous_planning.schedule.admin_users", [])
             # 如果没有配置管理员（空列表），则所有人都有权限
-            if not admin_users:
+            if not self._admin_set:
                 return True
 
             user_id = str(self.message.message_info.user_info.user_id)
-            return user_id in admin_users
+            return user_id in self._admin_set
         except Exception as e:
             logger.warning(f"检查权限失败: {e}")
             # 出错时默认有权限（保持向后兼容）
@@ -112,12 +134,11 @@ class PlanningCommand(BaseCommand):
                 schedule_goals = self._sort_schedule_goals(schedule_goals)
 
                 # 获取今天的日期和星期
-                today = self.tz_manager.get_now().strftime("%Y-%m-%d")
-                weekday_cn = {0: "周一", 1: "周二", 2: "周三", 3: "周四", 4: "周五", 5: "周六", 6: "周日"}
-                weekday = weekday_cn[self.tz_manager.get_now().weekday()]
+                today_label = self._get_today_label()
 
-                messages = [f"📅 今日日程 {today} {weekday}\n"]
-                messages.append(f"共 {len(schedule_goals)} 项活动\n")
+                header = f"📅 今日日程 {today_label}\n\n共 {len(schedule_goals)} 项活动\n\n"
+                # 每个活动拼成一个完整文本块（含结尾空行），最后一次性拼接
+                parts = []
 
                 for idx, goal in enumerate(schedule_goals, 1):
                     # 获取时间窗口
@@ -128,28 +149,19 @@ class PlanningCommand(BaseCommand):
                     end_time = self._format_time_from_minutes(end_minutes)
 
                     # 目标类型emoji
-                    type_emoji = {
-                        "meal": "🍽️",
-                        "study": "📚",
-                        "entertainment": "🎮",
-                        "daily_routine": "🏠",
-                        "social_maintenance": "💬",
-                        "learn_topic": "📖",
-                        "exercise": "🏃",
-                        "rest": "💤",
-                        "free_time": "🌟",
-                    }.get(goal.goal_type, "📌")
+                    type_emoji = _GOAL_TYPE_EMOJI.get(goal.goal_type, "📌")
 
                     # 详细格式：序号、时间、emoji、名称
-                    messages.append(f"{idx}. ⏰ {start_time}-{end_time}  {type_emoji} {goal.name}")
-
-                    # 根据配置决定是否添加描述
+                    # 根据配置决定是否添加描述，块末尾空行分隔
                     if self.enable_detailed_description and goal.description:
-                        messages.append(f"   📝 {goal.description}")
+                        parts.append(
+                            f"{idx}. ⏰ {start_time}-{end_time}  {type_emoji} {goal.name}\n"
+                            f"   📝 {goal.description}\n\n"
+                        )
+                    else:
+                        parts.append(f"{idx}. ⏰ {start_time}-{end_time}  {type_emoji} {goal.name}\n\n")
 
-                    messages.append("")  # 空行分隔
-
-                await self.send_text("\n".join(messages))
+                await self.send_text(header + "".join(parts))
 
         elif subcommand == "list":
             # 列出目标 - 图片格式
@@ -181,18 +193,16 @@ class PlanningCommand(BaseCommand):
 
                 # 生成图片
                 img_path = None
-                img_base64 = None
                 try:
                     # 简化标题：只显示日期，不显示emoji
-                    today = self.tz_manager.get_now().strftime("%Y-%m-%d")
-                    weekday_cn = {0: "周一", 1: "周二", 2: "周三", 3: "周四", 4: "周五", 5: "周六", 6: "周日"}
-                    weekday = weekday_cn[self.tz_manager.get_now().weekday()]
-                    title = f"今日日程 {today} {weekday}"
+                    title = f"今日日程 {self._get_today_label()}"
 
-                    img_path, img_base64 = ScheduleImageGenerator.generate_schedule_image(
+                    # 通过 imageurl 发送本地文件，只需要路径（不触发 base64 编码）；
+                    # 渲染在线程中执行，避免阻塞事件循环
+                    img_path = (await ScheduleImageGenerator.generate_schedule_image_async(
                         title=title,
                         schedule_items=schedule_items
-                    )
+                    )).path
 
                     # 使用imageurl发送文件路径（适合本地文件）
                     await self.send_custom("imageurl", f"file://{img_path}")
@@ -202,14 +212,14 @@ class PlanningCommand(BaseCommand):
                     logger.error(f"发送图片失败: {e}, 使用文本输出")
                     # 降级方案：文本输出
                     try:
-                        messages = ["📅 今日日程详情\n"]
+                        parts = []
                         for item in schedule_items:
-                            messages.append(f"  ⏰ {item['time']}  {item['name']}")
                             # 根据配置决定是否显示描述
                             if self.enable_detailed_description and item['description']:
-                                messages.append(f"     {item['description']}")
-                            messages.append("")
-                        await self.send_text("\n".join(messages))
+                                parts.append(f"  ⏰ {item['time']}  {item['name']}\n     {item['description']}\n\n")
+                            else:
+                                parts.append(f"  ⏰ {item['time']}  {item['name']}\n\n")
+                        await self.send_text("📅 今日日程详情\n\n" + "".join(parts))
                     except Exception as e2:
                         logger.error(f"文本输出也失败: {e2}")
 
@@ -264,7 +274,6 @@ class PlanningCommand(BaseCommand):
                 days_to_keep = int(parts[2])
 
             # 计算截止日期
-            from datetime import timedelta
             cutoff_date = self.tz_manager.get_now() - timedelta(days=days_to_keep)
             today_str = self.tz_manager.get_now().strftime("%Y-%m-%d")
 
@@ -274,13 +283,7 @@ class PlanningCommand(BaseCommand):
 
             for g in goals:
                 # 检查是否是日程类型（有time_window）
-                has_time_window = False
-                if g.parameters and "time_window" in g.parameters:
-                    has_time_window = True
-                elif g.conditions and "time_window" in g.conditions:
-                    has_time_window = True
-
-                if not has_time_window:
+                if get_goal_time_window(g) is None:
                     continue  # 跳过非日程类型
 
                 if g.created_at:
@@ -303,11 +306,8 @@ class PlanningCommand(BaseCommand):
             if not to_delete:
                 await self.send_text(f"✨ 没有需要清理的旧日程")
             else:
-                # 执行删除
-                deleted_count = 0
-                for goal in to_delete:
-                    if goal_manager.delete_goal(goal.goal_id):
-                        deleted_count += 1
+                # 执行删除（单个事务批量删除）
+                deleted_count = goal_manager.delete_goals([goal.goal_id for goal in to_delete])
 
                 if deleted_count > 0:
                     today_schedule_count = len(self._get_today_schedule_goals(goal_manager))
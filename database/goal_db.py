@@ -61,6 +61,9 @@ class GoalDatabase:
     # Database schema version for migrations
     SCHEMA_VERSION = 1
 
+    # Max bound parameters per statement (SQLite default limit is 999)
+    _MAX_SQL_VARIABLES = 500
+
     def __init__(self, db_path: str = "data/goals.db", backup_on_init: bool = True, timezone: str = "Asia/Shanghai"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -394,18 +397,29 @@ class GoalDatabase:
 
         Args:
             goal_id: Goal identifier
-            **kwargs: Fields to update
+            **kwargs: Fields to update. ``parameters_patch`` (dict) merges keys
+                into the stored parameters inside SQLite (JSON merge patch)
+                instead of replacing the whole column.
 
         Returns:
             True if goal was updated, False if not found
         """
-        if not kwargs:
+        parameters_patch = kwargs.pop('parameters_patch', None)
+        if not kwargs and not parameters_patch:
             return False
 
         # Build UPDATE query dynamically
         set_clauses = []
         params = []
 
+        if parameters_patch:
+            if kwargs.get('parameters') is not None:
+                # Full replacement given as well: apply the patch on top of it
+                kwargs['parameters'] = {**kwargs['parameters'], **parameters_patch}
+            else:
+                set_clauses.append("parameters = json_patch(COALESCE(NULLIF(parameters, ''), '{}'), ?)")
+                params.append(json.dumps(parameters_patch))
+
         for key, value in kwargs.items():
             if key in ['conditions', 'parameters'] and value is not None:
                 set_clauses.append(f"{key} = ?")
@@ -457,6 +471,35 @@ class GoalDatabase:
 
         return deleted
 
+    def delete_goals(self, goal_ids: List[str]) -> int:
+        """Delete multiple goals in a single transaction.
+
+        Args:
+            goal_ids: Goal identifiers
+
+        Returns:
+            Number of goals deleted
+        """
+        if not goal_ids:
+            return 0
+
+        deleted_count = 0
+        with self._transaction() as conn:
+            # 分批构造 IN 子句，避免超出 SQLite 变量数量上限（999）
+            for i in range(0, len(goal_ids), self._MAX_SQL_VARIABLES):
+                batch = goal_ids[i:i + self._MAX_SQL_VARIABLES]
+                placeholders = ",".join("?" * len(batch))
+                cursor = conn.execute(
+                    f"DELETE FROM goals WHERE goal_id IN ({placeholders})",
+                    batch
+                )
+                deleted_count += cursor.rowcount
+
+        if deleted_count > 0:
+            logger.debug(f"Deleted {deleted_count} goals in batch")
+
+        return deleted_count
+
     def delete_goals_by_status(self, status: str, older_than: Optional[datetime] = None) -> int:
         """Delete goals by status and optionally by age.
 
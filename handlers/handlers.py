@@ -1,9 +1,15 @@
 """自主规划插件 - 事件处理器模块"""
 
 import asyncio
-import time
+from bisect import bisect_right
+from time import monotonic
 from typing import Optional, List, Dict, Any, Tuple
-from datetime import datetime
+from datetime import date, datetime
+
+try:
+    import ahocorasick  # 可选依赖：pyahocorasick，多关键词单遍扫描
+except ImportError:
+    ahocorasick = None
 
 from src.plugin_system import BaseEventHandler, EventType, MaiMessages, CustomEventHandlerResult
 from src.common.logger import get_logger
@@ -11,12 +17,31 @@ from src.common.logger import get_logger
 from ..planner.goal_manager import get_goal_manager
 from ..planner.schedule_generator import ScheduleGenerator
 from ..cache import LRUCache
-from ..utils.time_utils import parse_time_window
+from ..utils.time_utils import format_minutes_to_time, get_goal_time_window, parse_time_window
 from ..utils.timezone_manager import TimezoneManager
 from .exception_handler import handle_exception, handle_exception_silent
 
 logger = get_logger("autonomous_planning.handlers")
 
+
+def _build_keyword_automaton(keywords):
+    """构建关键词 Aho-Corasick 自动机（pyahocorasick 未安装时返回 None）
+
+    Args:
+        keywords: 关键词集合
+
+    Returns:
+        ahocorasick.Automaton 对象或 None
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
 class AutonomousPlannerEventHandler(BaseEventHandler):
     """自主规划事件处理器 - 定期清理过期目标"""
 
@@ -128,6 +153,8 @@ class ScheduleInjectEventHandler(BaseEventHandler):
 
     # P1优化：预编译正则表达式，一次匹配所有关键词
     _TIME_KEYWORDS_PATTERN = __import__('re').compile('|'.join(TIME_KEYWORDS))
+    # 安装了 pyahocorasick 时使用自动机单遍扫描（与关键词数量无关），否则为 None
+    _TIME_KEYWORDS_AUTOMATON = _build_keyword_automaton(TIME_KEYWORDS)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -145,11 +172,13 @@ class ScheduleInjectEventHandler(BaseEventHandler):
         # 缓存配置
         self._schedule_cache_ttl = self.get_config("autonomous_planning.schedule.cache_ttl", 300)
         self._cache_cleanup_interval = 600  # 10分钟清理一次
-        self._last_cache_cleanup = 0  # 上次清理时间
+        self._last_cache_cleanup = 0.0  # 上次清理时间（单调时钟）
+        # 目标创建日期缓存（goal_id -> "YYYY-MM-DD"），与日程缓存同生命周期
+        self._goal_date_cache: Dict[str, Optional[str]] = {}
 
         # 日程生成锁（防止并发生成）
         self._generate_lock = asyncio.Lock()
-        self._last_schedule_check_date = None
+        self._last_schedule_check_date: Optional[date] = None  # 上次检查日程的日期（date对象，比较无需格式化）
 
         # 🆕 智能注入组件初始化
         try:
@@ -241,7 +270,7 @@ class ScheduleInjectEventHandler(BaseEventHandler):
         获取配置时区的当前时间
 
         根据插件配置中的时区设置，返回对应时区的当前时间。
-        如果pytz模块未安装或时区配置错误，则回退到系统时间。
+        如果时区数据不可用或时区配置错误，则回退到系统时间。
 
         Returns:
             datetime.datetime: 当前时间对象
@@ -258,6 +287,35 @@ class ScheduleInjectEventHandler(BaseEventHandler):
         self._get_current_schedule("global")
         logger.debug("✅ 日程缓存预热完成")
 
+    def _get_goal_created_date(self, goal) -> Optional[str]:
+        """
+        获取目标的创建日期字符串（按goal_id缓存，避免重复解析）
+
+        created_at 可能是 datetime 对象或 ISO 格式字符串。
+
+        Args:
+            goal: 目标对象
+
+        Returns:
+            "YYYY-MM-DD" 格式的日期字符串，无法解析时返回None
+        """
+        goal_id = goal.goal_id
+        if goal_id in self._goal_date_cache:
+            return self._goal_date_cache[goal_id]
+
+        goal_date = None
+        if goal.created_at:
+            try:
+                if isinstance(goal.created_at, str):
+                    goal_date = goal.created_at.split("T")[0]
+                else:
+                    goal_date = goal.created_at.strftime("%Y-%m-%d")
+            except Exception as e:
+                logger.debug(f"解析目标创建时间失败: {goal.created_at} - {e}")
+
+        self._goal_date_cache[goal_id] = goal_date
+        return goal_date
+
     @handle_exception("检查今天日程失败: {e}", log_level="warning", default_return=False)
     def _check_today_schedule_exists(self, chat_id: str = "global") -> bool:
         """
@@ -281,25 +339,9 @@ class ScheduleInjectEventHandler(BaseEventHandler):
         # 检查是否有今天创建的带time_window的目标
         for goal in goals:
             # 检查是否有time_window（日程类型的标志）
-            has_time_window = False
-            if goal.parameters and "time_window" in goal.parameters:
-                has_time_window = True
-            elif goal.conditions and "time_window" in goal.conditions:
-                has_time_window = True
-
-            if has_time_window:
+            if get_goal_time_window(goal) is not None:
                 # 检查创建时间是否是今天
-                goal_date = None
-                if goal.created_at:
-                    try:
-                        if isinstance(goal.created_at, str):
-                            goal_date = goal.created_at.split("T")[0]
-                        else:
-                            goal_date = goal.created_at.strftime("%Y-%m-%d")
-                    except Exception as e:
-                        logger.debug(f"解析目标创建时间失败: {goal.created_at} - {e}")
-
-                if goal_date == today_str:
+                if self._get_goal_created_date(goal) == today_str:
                     logger.debug(f"找到今天的日程目标: {goal.name}")
                     return True
 
@@ -368,15 +410,84 @@ class ScheduleInjectEventHandler(BaseEventHandler):
 
         if created_ids:
             logger.info(f"✅ 自动生成日程成功，创建了 {len(created_ids)} 个目标")
-            # 清理缓存，强制重新加载
-            self._schedule_cache.clear()
             # 🔧 修复：统一使用时区感知时间
-            self._last_schedule_check_date = self._get_timezone_now().strftime("%Y-%m-%d")
+            today = self._get_timezone_now().date()
+            # 只失效今天的日程缓存，强制重新加载（保留其他缓存项）
+            self._invalidate_schedule_cache(today.strftime("%Y-%m-%d"))
+            self._goal_date_cache.clear()
+            self._last_schedule_check_date = today
             return True
         else:
             logger.warning("⚠️ 日程生成失败，没有创建任何目标")
             return False
 
+    async def _ensure_today_schedule(self, message: MaiMessages, today: date) -> bool:
+        """检查今天是否有日程，没有则自动生成（持锁执行，保证检查+生成的原子性）
+
+        Args:
+            message: 消息对象
+            today: 今天的日期
+
+        Returns:
+            本次是否尝试了生成日程
+        """
+        generation_attempted = False
+
+        # 使用锁确保检查+生成的原子性，防止竞态条件
+        async with self._generate_lock:
+            # 双重检查：等待锁期间其他消息可能已完成检查
+            if self._last_schedule_check_date != today:
+                has_schedule = self._check_today_schedule_exists(chat_id="global")
+
+                if not has_schedule:
+                    logger.info("📅 今天还没有日程，准备自动生成...")
+
+                    # 获取用户ID
+                    user_id = "system"
+                    base_info = getattr(message, 'message_base_info', None)
+                    if base_info:
+                        user_id = base_info.get('user_id', 'system')
+
+                    # P0修复：添加超时保护（可配置，默认3分钟）
+                    generation_timeout = self.get_config("autonomous_planning.schedule.generation_timeout", 180.0)
+                    generation_task = None
+                    try:
+                        # 🆕 创建任务以便超时时主动取消
+                        generation_task = asyncio.create_task(
+                            self._auto_generate_today_schedule(user_id, chat_id="global")
+                        )
+                        generation_success = await asyncio.wait_for(
+                            generation_task,
+                            timeout=generation_timeout
+                        )
+                    except asyncio.TimeoutError:
+                        logger.error(f"⏰ 日程生成超时（{generation_timeout}秒），跳过本次生成")
+                        # 🆕 P0级：超时后主动取消任务，避免后台继续运行
+                        if generation_task and not generation_task.done():
+                            generation_task.cancel()
+                            try:
+                                await generation_task
+                            except asyncio.CancelledError:
+                                logger.debug("已取消超时的日程生成任务")
+                        generation_success = False
+                    except Exception as e:
+                        logger.error(f"日程生成异常: {e}", exc_info=True)
+                        generation_success = False
+
+                    if generation_success:
+                        logger.info("✅ 日程自动生成完成，继续注入")
+                    else:
+                        logger.warning("⚠️ 日程自动生成失败")
+
+                    generation_attempted = True
+                else:
+                    logger.debug("今天已有日程，跳过自动生成")
+
+                # 更新检查日期（无论是否生成成功）
+                self._last_schedule_check_date = today
+
+        return generation_attempted
+
     @handle_exception("判断是否注入日程失败: {e}", log_level="warning", default_return=False)
     def _should_inject_schedule(self, message: MaiMessages) -> bool:
         """
@@ -421,11 +532,19 @@ class ScheduleInjectEventHandler(BaseEventHandler):
         # 向后兼容：使用传统关键词匹配
         logger.debug("智能组件未加载，使用传统关键词匹配")
 
+        # 优先使用 Aho-Corasick 自动机（可选依赖）单遍扫描所有关键词
+        automaton = self._TIME_KEYWORDS_AUTOMATON
+        if automaton is not None:
+            for _, keyword in automaton.iter(user_message):
+                logger.info(f"检测到时间关键词: {keyword}，将注入日程")
+                return True
+
         # P1优化：使用预编译正则一次匹配所有关键词
-        match = self._TIME_KEYWORDS_PATTERN.search(user_message)
-        if match:
-            logger.info(f"检测到时间关键词: {match.group()}，将注入日程")
-            return True
+        if automaton is None:
+            match = self._TIME_KEYWORDS_PATTERN.search(user_message)
+            if match:
+                logger.info(f"检测到时间关键词: {match.group()}，将注入日程")
+                return True
 
         # 规则2：短消息 + 问号（可能是询问）
         if len(user_message) < 5 and ("?" in user_message or "？" in user_message):
@@ -448,30 +567,37 @@ class ScheduleInjectEventHandler(BaseEventHandler):
         user_message = ""
 
         # 🔧 优先级1: 从message_base_info提取原始消息
-        if hasattr(message, 'message_base_info') and message.message_base_info:
+        base_info = getattr(message, 'message_base_info', None)
+        if base_info:
             # 尝试多个可能的字段
             user_message = (
-                message.message_base_info.get('message') or
-                message.message_base_info.get('original_message') or
-                message.message_base_info.get('content') or
+                base_info.get('message') or
+                base_info.get('original_message') or
+                base_info.get('content') or
                 ""
             )
             if user_message:
-                logger.debug(f"从message_base_info提取到用户消息: '{str(user_message)[:50]}...'")
-                return str(user_message)
+                if not isinstance(user_message, str):
+                    user_message = str(user_message)
+                logger.debug(f"从message_base_info提取到用户消息: '{user_message[:50]}...'")
+                return user_message
 
         # 🔧 优先级2: 从raw_message提取（可能更原始）
-        if hasattr(message, 'raw_message') and message.raw_message:
+        raw = getattr(message, 'raw_message', None)
+        if raw:
             # raw_message可能更接近原始消息
-            raw = str(message.raw_message)
+            if not isinstance(raw, str):
+                raw = str(raw)
             # 如果raw_message不包含聊天记录标记，则使用它
             if '群里正在进行的聊天内容' not in raw and len(raw) < 200:
                 logger.debug(f"从raw_message提取到用户消息: '{raw[:50]}...'")
                 return raw
 
         # 🔧 优先级3: 从plain_text提取（但可能包含聊天记录）
-        if hasattr(message, 'plain_text') and message.plain_text:
-            plain = str(message.plain_text)
+        plain = getattr(message, 'plain_text', None)
+        if plain:
+            if not isinstance(plain, str):
+                plain = str(plain)
             # 如果plain_text很短且不包含聊天记录，则使用
             if '群里正在进行的聊天内容' not in plain and len(plain) < 200:
                 logger.debug(f"从plain_text提取到用户消息: '{plain[:50]}...'")
@@ -489,8 +615,9 @@ class ScheduleInjectEventHandler(BaseEventHandler):
         Returns:
             用户ID，如果获取失败则返回'unknown'
         """
-        if hasattr(message, 'message_base_info') and message.message_base_info:
-            return str(message.message_base_info.get('user_id', 'unknown'))
+        base_info = getattr(message, 'message_base_info', None)
+        if base_info:
+            return str(base_info.get('user_id', 'unknown'))
         return 'unknown'
 
     def _build_smart_inject_prompt(
@@ -618,7 +745,7 @@ class ScheduleInjectEventHandler(BaseEventHandler):
             return True, True, None, None, None
 
         try:
-            chat_id = message.stream_id if hasattr(message, 'stream_id') else None
+            chat_id = getattr(message, 'stream_id', None)
             if not chat_id:
                 return True, True, None, None, None
 
@@ -634,63 +761,19 @@ class ScheduleInjectEventHandler(BaseEventHandler):
                     user_id, None  # 当前活动稍后获取
                 )
 
+            # 本次消息处理只读取一次当前时间
+            # 🔧 修复：统一使用 _get_timezone_now() 处理时区
+            now = self._get_timezone_now()
+
             # P0修复：检查今天是否有日程，没有则自动生成（原子化操作）
-            if self.auto_generate_schedule:
-                # 🔧 修复：统一使用 _get_timezone_now() 处理时区
-                today_str = self._get_timezone_now().strftime("%Y-%m-%d")
-
-                # 使用锁确保检查+生成的原子性，防止竞态条件
-                async with self._generate_lock:
-                    # 只在今天还没检查过的情况下检查
-                    if self._last_schedule_check_date != today_str:
-                        has_schedule = self._check_today_schedule_exists(chat_id="global")
-
-                        if not has_schedule:
-                            logger.info("📅 今天还没有日程，准备自动生成...")
-
-                            # 获取用户ID
-                            user_id = "system"
-                            if hasattr(message, 'message_base_info') and message.message_base_info:
-                                user_id = message.message_base_info.get('user_id', 'system')
-
-                            # P0修复：添加超时保护（可配置，默认3分钟）
-                            generation_timeout = self.get_config("autonomous_planning.schedule.generation_timeout", 180.0)
-                            generation_task = None
-                            try:
-                                # 🆕 创建任务以便超时时主动取消
-                                generation_task = asyncio.create_task(
-                                    self._auto_generate_today_schedule(user_id, chat_id="global")
-                                )
-                                generation_success = await asyncio.wait_for(
-                                    generation_task,
-                                    timeout=generation_timeout
-                                )
-                            except asyncio.TimeoutError:
-                                logger.error(f"⏰ 日程生成超时（{generation_timeout}秒），跳过本次生成")
-                                # 🆕 P0级：超时后主动取消任务，避免后台继续运行
-                                if generation_task and not generation_task.done():
-                                    generation_task.cancel()
-                                    try:
-                                        await generation_task
-                                    except asyncio.CancelledError:
-                                        logger.debug("已取消超时的日程生成任务")
-                                generation_success = False
-                            except Exception as e:
-                                logger.error(f"日程生成异常: {e}", exc_info=True)
-                                generation_success = False
-
-                            if generation_success:
-                                logger.info("✅ 日程自动生成完成，继续注入")
-                            else:
-                                logger.warning("⚠️ 日程自动生成失败")
-                        else:
-                            logger.debug("今天已有日程，跳过自动生成")
-
-                        # 更新检查日期（无论是否生成成功）
-                        self._last_schedule_check_date = today_str
+            # 快速路径：今天已经检查过则既不格式化日期也不获取锁（绝大多数消息走这里）
+            if self.auto_generate_schedule and self._last_schedule_check_date != now.date():
+                if await self._ensure_today_schedule(message, now.date()):
+                    # 生成可能耗时数分钟，刷新当前时间
+                    now = self._get_timezone_now()
 
             # 获取当前日程（现在返回所有未来活动列表）
-            current_activity, current_description, all_future_activities, activity_type = self._get_current_schedule(chat_id)
+            current_activity, current_description, all_future_activities, activity_type = self._get_current_schedule(chat_id, now)
 
             # 🆕 更新对话上下文缓存中的当前活动信息
             if self.context_cache and context_continue_inject:
@@ -837,7 +920,10 @@ class ScheduleInjectEventHandler(BaseEventHandler):
 
             # 注入日程信息到prompt
             if inject_content:
-                original_prompt = str(message.llm_prompt)
+                # llm_prompt 通常已是 str，仅在不是时才做转换
+                original_prompt = message.llm_prompt
+                if not isinstance(original_prompt, str):
+                    original_prompt = str(original_prompt)
                 new_prompt = inject_content + "\n" + original_prompt
                 message.modify_llm_prompt(new_prompt, suppress_warning=True)
 
@@ -848,24 +934,43 @@ class ScheduleInjectEventHandler(BaseEventHandler):
             return True, True, None, None, None
 
     def _cleanup_expired_cache(self, current_time: float):
-        """清理过期的缓存项（P0修复：线程安全）"""
-        # 使用锁保护，防止与并发的get/set操作冲突
-        with self._schedule_cache._lock:
-            expired_keys = []
+        """清理过期的缓存项（线程安全：由 LRUCache 在锁内完成遍历与删除）"""
+        ttl = self._schedule_cache_ttl
+        # 缓存值格式：(result, cached_time)
+        removed = self._schedule_cache.pop_where(lambda _key, entry: current_time - entry[1] > ttl)
+        if removed:
+            logger.debug(f"清理了 {removed} 个过期缓存项")
 
-            # 使用list()创建快照避免迭代时修改
-            for key, (_, cached_time) in list(self._schedule_cache.cache.items()):
-                if current_time - cached_time > self._schedule_cache_ttl:
-                    expired_keys.append(key)
+        # 创建日期缓存随周期清理一并重置，防止已删除目标的条目累积
+        self._goal_date_cache.clear()
 
-            for key in expired_keys:
-                if key in self._schedule_cache.cache:
-                    del self._schedule_cache.cache[key]
+    def _invalidate_schedule_cache(self, date_str: str):
+        """失效指定日期的日程缓存项（缓存键格式：(chat_id, YYYY-MM-DD, 窗口编号)）
 
-            if expired_keys:
-                logger.debug(f"清理了 {len(expired_keys)} 个过期缓存项")
+        Args:
+            date_str: 日期字符串（YYYY-MM-DD）
+        """
+        removed = self._schedule_cache.pop_where(lambda key, _entry: key[1] == date_str)
+        if removed:
+            logger.debug(f"失效了 {removed} 个 {date_str} 的日程缓存项")
+
+    @staticmethod
+    def _derive_time_fields(now: datetime) -> Tuple[int, str, int]:
+        """
+        从当前时间一次性推导日程查询所需的时间字段
+
+        Args:
+            now: 当前时间（时区感知）
+
+        Returns:
+            (当天分钟数, 日期字符串YYYY-MM-DD, 15分钟缓存窗口编号)
+        """
+        current_time_minutes = now.hour * 60 + now.minute
+        return current_time_minutes, now.strftime("%Y-%m-%d"), current_time_minutes // 15
 
-    def _get_current_schedule(self, chat_id: Optional[str] = None) -> Tuple[Optional[str], Optional[str], List[Tuple[str, str]], Optional[str]]:
+    def _get_current_schedule(
+        self, chat_id: Optional[str] = None, now: Optional[datetime] = None
+    ) -> Tuple[Optional[str], Optional[str], List[Tuple[str, str]], Optional[str]]:
         """
         获取当前日程信息（带优化缓存）
 
@@ -873,33 +978,36 @@ class ScheduleInjectEventHandler(BaseEventHandler):
         1. 缓存TTL从30秒提升到5分钟
         2. 缓存键改为按小时（而非5分钟窗口），提高命中率
         3. 定期清理过期缓存，避免内存泄漏
+        4. 调用方可传入已获取的当前时间，避免重复读取时钟
+
+        Args:
+            chat_id: 聊天ID
+            now: 当前时间（可选，默认读取配置时区的当前时间）
 
         Returns:
             (当前活动, 活动描述, 所有未来活动列表, 当前活动类型)
             其中未来活动列表格式: [(时间, 活动名), ...]
         """
-        import time
-
-        # 获取当前时间
+        # 获取当前时间（墙钟只读一次；TTL比较使用单调时钟，不受系统时间跳变影响）
         # 🔧 修复：统一使用时区感知时间
-        now = self._get_timezone_now()
-        current_hour = now.hour
-        current_minute = now.minute
-        current_time = time.time()
+        if now is None:
+            now = self._get_timezone_now()
+        current_time = monotonic()
+        current_time_minutes, today_date, window_id = self._derive_time_fields(now)
 
         # P1修复：按15分钟窗口缓存（而非按小时），提高精度同时保持命中率
         # 原因：同一小时内活动可能变化，但15分钟内基本稳定
-        time_window = (current_hour * 60 + current_minute) // 15
-        cache_key = f"{chat_id or 'global'}_{now.strftime('%Y%m%d')}_{time_window}"
+        cache_key = (chat_id or 'global', today_date, window_id)
 
         # 定期清理过期缓存（避免内存无限增长）
         if current_time - self._last_cache_cleanup > self._cache_cleanup_interval:
             self._cleanup_expired_cache(current_time)
             self._last_cache_cleanup = current_time
 
-        # 检查缓存是否有效
-        if cache_key in self._schedule_cache:
-            cached_result, cached_time = self._schedule_cache[cache_key]
+        # 检查缓存是否有效（单次查找，未命中返回None）
+        entry = self._schedule_cache.get_sync(cache_key)
+        if entry is not None:
+            cached_result, cached_time = entry
             if current_time - cached_time < self._schedule_cache_ttl:
                 # 缓存命中
                 return cached_result
@@ -920,29 +1028,15 @@ class ScheduleInjectEventHandler(BaseEventHandler):
                 self._schedule_cache[cache_key] = (result, current_time)
                 return result
 
-            current_time_minutes = current_hour * 60 + current_minute
-            today_date = now.strftime("%Y-%m-%d")
-
             # 找到有时间窗口的目标，优先选择今天创建的
             scheduled_goals = []
             for goal in goals:
                 # 向后兼容：优先从parameters读取time_window，其次从conditions读取
-                time_window = None
-                if goal.parameters and "time_window" in goal.parameters:
-                    time_window = goal.parameters.get("time_window")
-                elif goal.conditions:
-                    time_window = goal.conditions.get("time_window")
+                time_window = get_goal_time_window(goal)
 
                 if time_window:
-                    # 检查是否是今天创建的任务
-                    # created_at 可能是 datetime 对象或字符串
-                    is_today = False
-                    if goal.created_at:
-                        if isinstance(goal.created_at, str):
-                            is_today = goal.created_at.startswith(today_date)
-                        else:
-                            # datetime 对象
-                            is_today = goal.created_at.strftime("%Y-%m-%d") == today_date
+                    # 检查是否是今天创建的任务（创建日期按goal_id缓存）
+                    is_today = self._get_goal_created_date(goal) == today_date
                     scheduled_goals.append((goal, time_window, is_today))
 
             if not scheduled_goals:
@@ -950,19 +1044,19 @@ class ScheduleInjectEventHandler(BaseEventHandler):
                 self._schedule_cache[cache_key] = (result, current_time)
                 return result
 
-            # 排序：按开始时间（兼容新旧格式）
-            def get_start_minutes(item):
-                goal, time_window, is_today = item
-                if not time_window or len(time_window) < 2:
-                    return 0
-                start_val = time_window[0]
-                # 判断格式：end_val > 24 说明是分钟格式
-                if time_window[1] > 24:
-                    return start_val
-                else:
-                    return start_val * 60
+            # 解析时间窗口并按开始时间排序，之后用二分查找定位当前时刻
+            timed_goals = []
+            for goal, time_window, is_today in scheduled_goals:
+                start_minutes, end_minutes = parse_time_window(time_window)
+                if start_minutes is None:
+                    continue
+                timed_goals.append((start_minutes, end_minutes, goal, is_today))
 
-            scheduled_goals.sort(key=get_start_minutes)
+            # 稳定排序：同一开始时间保持原有顺序
+            timed_goals.sort(key=lambda item: item[0])
+            starts = [item[0] for item in timed_goals]
+            # idx 之前的活动已开始（start <= now），idx 及之后的活动都在未来
+            idx = bisect_right(starts, current_time_minutes)
 
             # 查找当前活动（仅选择今天创建的任务）
             current_activity = None
@@ -970,56 +1064,32 @@ class ScheduleInjectEventHandler(BaseEventHandler):
             current_activity_type = None  # 🆕 新增：活动类型
             current_goal_created_at = None
 
-            for goal, time_window, is_today in scheduled_goals:
-                start_minutes, end_minutes = parse_time_window(time_window)
-                if start_minutes is None:
+            for position, (start_minutes, end_minutes, goal, is_today) in enumerate(timed_goals):
+                if not is_today:
                     continue
 
-                # 处理跨夜时间窗口（end_minutes > 1440）
-                # 例如 23:00-01:00 会被转换为 [1380, 1500]
-                is_in_window = False
-                if end_minutes > 1440:
-                    # 跨夜任务：检查当前时间是否在开始时间之后，或在（结束时间-1440）之前
-                    # 例如：1380 <= 1410 < 1500 或 0 <= 30 < 60
-                    is_in_window = (start_minutes <= current_time_minutes < 1440) or (0 <= current_time_minutes < (end_minutes - 1440))
+                if position < idx:
+                    # 已开始的活动：普通任务看是否未结束；跨夜任务（end_minutes > 1440）
+                    # 例如 23:00-01:00 会被转换为 [1380, 1500]，当天内开始后即处于窗口中
+                    is_in_window = end_minutes > 1440 or current_time_minutes < end_minutes
                 else:
-                    # 普通任务
-                    is_in_window = start_minutes <= current_time_minutes < end_minutes
+                    # 未开始的活动只可能是前一晚开始的跨夜任务仍在进行
+                    # 例如：[1380, 1500] 在 00:30 时满足 0 <= 30 < 60
+                    is_in_window = end_minutes > 1440 and current_time_minutes < (end_minutes - 1440)
 
                 if is_in_window:
-                    # 仅选择今天创建的任务
-                    if is_today:
-                        # 如果有多个今天的任务，选择创建时间最新的
-                        if current_activity is None or (goal.created_at and goal.created_at > current_goal_created_at):
-                            current_activity = goal.name
-                            current_description = goal.description
-                            current_activity_type = goal.goal_type  # 🆕 获取真实活动类型
-                            current_goal_created_at = goal.created_at
-
-            # 🆕 收集所有未来活动（优先选择今天的任务）
-            all_future_activities = []
-            for goal, time_window, is_today in scheduled_goals:
-                start_val = time_window[0] if len(time_window) > 0 else 0
-                end_val = time_window[1] if len(time_window) > 1 else start_val + 60
-
-                # 判断格式并转换
-                if end_val <= 24:
-                    start_minutes = start_val * 60
-                else:
-                    start_minutes = start_val
-
-                if start_minutes > current_time_minutes:
-                    # 转换为时:分格式
-                    hour = start_minutes // 60
-                    minute = start_minutes % 60
-                    time_str = f"{hour:02d}:{minute:02d}"
-
-                    # 添加到列表（今天的任务排在前面）
-                    if is_today:
-                        all_future_activities.append((time_str, goal.name))
-                    else:
-                        # 非今天的任务添加到末尾
-                        all_future_activities.append((time_str, goal.name))
+                    # 如果有多个今天的任务，选择创建时间最新的
+                    if current_activity is None or (goal.created_at and goal.created_at > current_goal_created_at):
+                        current_activity = goal.name
+                        current_description = goal.description
+                        current_activity_type = goal.goal_type  # 🆕 获取真实活动类型
+                        current_goal_created_at = goal.created_at
+
+            # 🆕 收集所有未来活动（已按开始时间排序），并转换为时:分格式
+            all_future_activities = [
+                (format_minutes_to_time(start_minutes), goal.name)
+                for start_minutes, _, goal, _ in timed_goals[idx:]
+            ]
 
             result = (current_activity, current_description, all_future_activities, current_activity_type)
             self._schedule_cache[cache_key] = (result, current_time)
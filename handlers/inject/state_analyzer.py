@@ -325,10 +325,8 @@ class ActivityStateAnalyzer:
             return "即将结束"
 
         # 转换为小时和分钟
-        elapsed_hours = elapsed // 60
-        elapsed_mins = elapsed % 60
-        remaining_hours = remaining // 60
-        remaining_mins = remaining % 60
+        elapsed_hours, elapsed_mins = divmod(elapsed, 60)
+        remaining_hours, remaining_mins = divmod(remaining, 60)
 
         # 构建描述
         parts = []
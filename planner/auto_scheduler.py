@@ -17,6 +17,7 @@ import datetime
 from typing import Optional
 
 from src.common.logger import get_logger
+from ..utils.time_utils import get_goal_time_window
 from ..utils.timezone_manager import TimezoneManager
 
 logger = get_logger("autonomous_planning.auto_scheduler")
@@ -38,6 +39,7 @@ class ScheduleAutoScheduler:
 
     Methods:
         start: 启动定时任务
+        warmup: 预热依赖资源
         stop: 停止定时任务
         _schedule_loop: 定时任务循环
         _generate_today_schedule: 生成今日日程
@@ -91,6 +93,18 @@ class ScheduleAutoScheduler:
         schedule_time = self.plugin.get_config("autonomous_planning.schedule.auto_schedule_time", "00:30")
         self.logger.info(f"日程定时生成已启动 - 执行时间: {schedule_time}")
 
+    async def warmup(self):
+        """
+        预热依赖资源
+
+        在后台线程中初始化目标管理器单例（打开数据库、建表、备份），
+        可与 start() 并发执行，避免首次生成日程时再阻塞事件循环。
+        """
+        try:
+            await asyncio.to_thread(self.get_goal_manager)
+        except Exception as e:
+            self.logger.warning(f"预热目标管理器失败: {e}")
+
     async def stop(self):
         """
         停止定时任务
@@ -173,11 +187,7 @@ class ScheduleAutoScheduler:
 
             for goal in goals:
                 # 检查目标是否有time_window（日程类型）
-                time_window = None
-                if goal.parameters and "time_window" in goal.parameters:
-                    time_window = goal.parameters["time_window"]
-                elif goal.conditions and "time_window" in goal.conditions:
-                    time_window = goal.conditions["time_window"]
+                time_window = get_goal_time_window(goal)
 
                 # 如果有time_window且创建时间是今天，说明已有日程
                 if time_window:
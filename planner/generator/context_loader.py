@@ -10,6 +10,7 @@ from typing import List, Optional
 from src.common.logger import get_logger
 
 # 类型提示导入
+from ...utils.time_utils import get_goal_time_window
 from ...utils.timezone_manager import TimezoneManager
 from ..goal_manager import GoalManager
 
@@ -51,11 +52,7 @@ class ScheduleContextLoader:
         Returns:
             time_window列表，如果不存在则返回None
         """
-        if goal.parameters and "time_window" in goal.parameters:
-            return goal.parameters["time_window"]
-        elif goal.conditions and "time_window" in goal.conditions:
-            return goal.conditions["time_window"]
-        return None
+        return get_goal_time_window(goal)
 
     def load_yesterday_schedule_summary(self) -> Optional[str]:
         """加载昨日日程摘要，用于生成今日日程的上下文
@@ -79,8 +76,7 @@ class ScheduleContextLoader:
                 if time_window:
                     # 将分钟数转换为时间字符串
                     start_minutes = time_window[0] if isinstance(time_window, list) else 0
-                    hour = start_minutes // 60
-                    minute = start_minutes % 60
+                    hour, minute = divmod(start_minutes, 60)
                     time_str = f"{hour:02d}:{minute:02d}"
 
                     yesterday_activities.append(f"{time_str} {goal.name}: {goal.description}")
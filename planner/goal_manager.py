@@ -29,6 +29,7 @@ Example:
     ... )
 """
 
+import threading
 import uuid
 from datetime import datetime, timedelta
 from enum import Enum
@@ -38,6 +39,7 @@ from typing import Any, Dict, List, Optional
 from src.common.logger import get_logger
 
 from ..database import GoalDatabase
+from ..utils.time_utils import get_goal_time_window
 from ..utils.timezone_manager import TimezoneManager
 
 logger = get_logger("autonomous_planning.goal_manager")
@@ -59,6 +61,11 @@ class GoalPriority(Enum):
     LOW = "low"
 
 
+# value -> member lookup tables (avoid EnumMeta.__call__ for every goal loaded from the database)
+_GOAL_STATUS_BY_VALUE: Dict[str, GoalStatus] = {member.value: member for member in GoalStatus}
+_GOAL_PRIORITY_BY_VALUE: Dict[str, GoalPriority] = {member.value: member for member in GoalPriority}
+
+
 class Goal:
     """Goal class representing a single goal.
 
@@ -80,6 +87,24 @@ class Goal:
         execution_count: Number of executions
     """
 
+    __slots__ = (
+        "goal_id",
+        "name",
+        "description",
+        "goal_type",
+        "priority",
+        "creator_id",
+        "chat_id",
+        "status",
+        "created_at",
+        "deadline",
+        "conditions",
+        "parameters",
+        "progress",
+        "last_executed_at",
+        "execution_count",
+    )
+
     def __init__(
         self,
         goal_id: str,
@@ -103,10 +128,14 @@ class Goal:
         self.name = name
         self.description = description
         self.goal_type = goal_type
-        self.priority = priority if isinstance(priority, GoalPriority) else GoalPriority(priority)
+        self.priority = priority if isinstance(priority, GoalPriority) else (
+            _GOAL_PRIORITY_BY_VALUE.get(priority) or GoalPriority(priority)
+        )
         self.creator_id = creator_id
         self.chat_id = chat_id
-        self.status = status if isinstance(status, GoalStatus) else GoalStatus(status)
+        self.status = status if isinstance(status, GoalStatus) else (
+            _GOAL_STATUS_BY_VALUE.get(status) or GoalStatus(status)
+        )
         # 使用时区感知时间（向后兼容）
         if created_at is None:
             tz_manager = TimezoneManager()  # 使用默认时区
@@ -199,7 +228,7 @@ class Goal:
         Returns:
             True if goal should be executed, False otherwise
         """
-        if self.status != GoalStatus.ACTIVE:
+        if self.status is not GoalStatus.ACTIVE:
             return False
 
         # Check time_window if present
@@ -469,13 +498,7 @@ class GoalManager:
 
         for goal in goals:
             # Check for time_window in parameters or conditions
-            has_time_window = False
-            if goal.parameters and "time_window" in goal.parameters:
-                has_time_window = True
-            elif goal.conditions and "time_window" in goal.conditions:
-                has_time_window = True
-
-            if has_time_window:
+            if get_goal_time_window(goal) is not None:
                 # Check creation date
                 goal_date = None
                 if goal.created_at:
@@ -496,11 +519,7 @@ class GoalManager:
 
             for goal in schedule_goals:
                 # 提取time_window作为唯一性标识的一部分
-                time_window = None
-                if goal.parameters and "time_window" in goal.parameters:
-                    time_window = tuple(goal.parameters["time_window"])
-                elif goal.conditions and "time_window" in goal.conditions:
-                    time_window = tuple(goal.conditions["time_window"])
+                time_window = tuple(get_goal_time_window(goal))
 
                 # 使用 (name, time_window) 作为唯一键
                 key = (goal.name, time_window)
@@ -523,7 +542,8 @@ class GoalManager:
 
         Args:
             goal_id: Goal identifier
-            **kwargs: Fields to update
+            **kwargs: Fields to update; pass ``parameters_patch={...}`` to merge
+                keys into the stored parameters without reading the goal first
 
         Returns:
             True if updated, False if not found
@@ -613,6 +633,17 @@ class GoalManager:
             logger.debug(f"Deleted goal: {goal_id}")
         return deleted
 
+    def delete_goals(self, goal_ids: List[str]) -> int:
+        """Delete multiple goals in one database round trip.
+
+        Args:
+            goal_ids: Goal identifiers
+
+        Returns:
+            Number of goals deleted
+        """
+        return self.db.delete_goals(list(goal_ids))
+
     def cleanup_old_goals(self, days: int = 30) -> int:
         """Clean up old completed/cancelled goals.
 
@@ -664,13 +695,7 @@ class GoalManager:
         expired_count = 0
         for goal in active_goals:
             # 检查是否为日程类型（有time_window）
-            has_time_window = False
-            if goal.parameters and "time_window" in goal.parameters:
-                has_time_window = True
-            elif goal.conditions and "time_window" in goal.conditions:
-                has_time_window = True
-
-            if not has_time_window:
+            if get_goal_time_window(goal) is None:
                 continue  # 跳过非日程类型的目标
 
             # 检查创建日期
@@ -716,10 +741,18 @@ class GoalManager:
         if not goals:
             return "📋 当前没有任何目标"
 
-        # Group by status
-        active = [g for g in goals if g.status == GoalStatus.ACTIVE]
-        paused = [g for g in goals if g.status == GoalStatus.PAUSED]
-        completed = [g for g in goals if g.status == GoalStatus.COMPLETED]
+        # Group by status in a single pass (completed goals are only counted)
+        active: List[Goal] = []
+        paused: List[Goal] = []
+        completed = 0
+        for g in goals:
+            status = g.status
+            if status is GoalStatus.ACTIVE:
+                active.append(g)
+            elif status is GoalStatus.PAUSED:
+                paused.append(g)
+            elif status is GoalStatus.COMPLETED:
+                completed += 1
 
         lines = [f"📋 目标总览 (共 {len(goals)} 个)\n"]
 
@@ -737,7 +770,7 @@ class GoalManager:
                 lines.append(f"   - {goal.name}")
 
         if completed:
-            lines.append(f"\n✅ 已完成 ({len(completed)}个)")
+            lines.append(f"\n✅ 已完成 ({completed}个)")
 
         return "\n".join(lines)
 
@@ -761,15 +794,22 @@ class GoalManager:
 
 # Global singleton
 _goal_manager: Optional[GoalManager] = None
+_goal_manager_lock = threading.Lock()
 
 
 def get_goal_manager() -> GoalManager:
     """Get global goal manager instance.
 
+    The instance may first be requested from a worker thread (scheduler
+    warmup) while the event loop requests it too, so creation is guarded
+    by a lock (double-checked) to guarantee a single GoalManager.
+
     Returns:
         GoalManager singleton instance
     """
     global _goal_manager
     if _goal_manager is None:
-        _goal_manager = GoalManager()
+        with _goal_manager_lock:
+            if _goal_manager is None:
+                _goal_manager = GoalManager()
     return _goal_manager
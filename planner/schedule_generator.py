@@ -30,6 +30,7 @@ from ..core.exceptions import (
     ScheduleGenerationError,
 )
 from ..core.models import Schedule, ScheduleItem, ScheduleType
+from ..utils.time_utils import get_goal_time_window
 from ..utils.timezone_manager import TimezoneManager
 from .goal_manager import GoalManager
 from .generator import (
@@ -131,11 +132,7 @@ class ScheduleGenerator:
                 schedule_items = []
                 for goal in existing_schedule:
                     # 提取time_window
-                    time_window = None
-                    if goal.parameters and "time_window" in goal.parameters:
-                        time_window = goal.parameters["time_window"]
-                    elif goal.conditions and "time_window" in goal.conditions:
-                        time_window = goal.conditions["time_window"]
+                    time_window = get_goal_time_window(goal)
 
                     # 转换为ScheduleItem
                     duration = None
@@ -144,8 +141,7 @@ class ScheduleGenerator:
 
                     time_slot = None
                     if time_window:
-                        hours = time_window[0] // 60
-                        minutes = time_window[0] % 60
+                        hours, minutes = divmod(time_window[0], 60)
                         time_slot = f"{hours:02d}:{minutes:02d}"
 
                     # 🔧 修复：如果priority是枚举对象，转换为字符串
@@ -407,8 +403,7 @@ class ScheduleGenerator:
                 # 使用 duration_hours 计算结束时间
                 if item.duration_hours:
                     total_minutes = start_hour * 60 + start_minute + int(item.duration_hours * 60)
-                    end_hour = total_minutes // 60
-                    end_minute = total_minutes % 60
+                    end_hour, end_minute = divmod(total_minutes, 60)
                     time_range = f"{start_hour:02d}:{start_minute:02d}-{end_hour:02d}:{end_minute:02d}"
                 else:
                     time_range = item.time_slot
@@ -1,18 +1,42 @@
 """麦麦自主规划插件 - 主文件"""
 
 import asyncio
+from functools import cache
 from typing import List, Tuple
 
 from src.plugin_system import BasePlugin, register_plugin, ConfigField
 from src.common.logger import get_logger
 
-from .tools import ManageGoalTool, GetPlanningStatusTool, GenerateScheduleTool, ApplyScheduleTool
 from .handlers import AutonomousPlannerEventHandler, ScheduleInjectEventHandler
 from .commands import PlanningCommand
 from .planner.auto_scheduler import ScheduleAutoScheduler
 
 logger = get_logger("autonomous_planning")
 
+
+@cache
+def _plugin_components() -> Tuple[Tuple, ...]:
+    """构建插件组件元组（首次调用时构建，之后直接返回缓存结果）
+
+    组件信息均来自类方法，与插件实例状态无关。
+    工具类在此处才导入，插件模块加载时不导入 tools 模块及其依赖。
+    """
+    from .tools import ManageGoalTool, GetPlanningStatusTool, GenerateScheduleTool, ApplyScheduleTool
+
+    return (
+        # Tools - 供 LLM 直接调用的工具
+        (ManageGoalTool.get_tool_info(), ManageGoalTool),
+        (GetPlanningStatusTool.get_tool_info(), GetPlanningStatusTool),
+        (GenerateScheduleTool.get_tool_info(), GenerateScheduleTool),
+        (ApplyScheduleTool.get_tool_info(), ApplyScheduleTool),
+        # Event Handlers - 事件处理器
+        (AutonomousPlannerEventHandler.get_handler_info(), AutonomousPlannerEventHandler),
+        (ScheduleInjectEventHandler.get_handler_info(), ScheduleInjectEventHandler),
+        # Commands - 命令处理
+        (PlanningCommand.get_command_info(), PlanningCommand),
+    )
+
+
 @register_plugin
 class AutonomousPlanningPlugin(BasePlugin):
     """麦麦自主规划插件"""
@@ -244,20 +268,11 @@ class AutonomousPlanningPlugin(BasePlugin):
     async def _start_scheduler_after_delay(self):
         """延迟启动调度器（10秒后）"""
         await asyncio.sleep(10)
-        self.scheduler = ScheduleAutoScheduler(self)
-        await self.scheduler.start()
+        # 构造过程包含时区加载与模块导入等同步操作，放到线程中执行避免阻塞事件循环
+        self.scheduler = await asyncio.to_thread(ScheduleAutoScheduler, self)
+        # 启动定时任务与预热依赖资源并发进行
+        await asyncio.gather(self.scheduler.start(), self.scheduler.warmup())
 
-    def get_plugin_components(self) -> List[Tuple]:
-        """获取插件组件"""
-        return [
-            # Tools - 供 LLM 直接调用的工具
-            (ManageGoalTool.get_tool_info(), ManageGoalTool),
-            (GetPlanningStatusTool.get_tool_info(), GetPlanningStatusTool),
-            (GenerateScheduleTool.get_tool_info(), GenerateScheduleTool),
-            (ApplyScheduleTool.get_tool_info(), ApplyScheduleTool),
-            # Event Handlers - 事件处理器
-            (AutonomousPlannerEventHandler.get_handler_info(), AutonomousPlannerEventHandler),
-            (ScheduleInjectEventHandler.get_handler_info(), ScheduleInjectEventHandler),
-            # Commands - 命令处理
-            (PlanningCommand.get_command_info(), PlanningCommand),
-        ]
+    def get_plugin_components(self) -> Tuple[Tuple, ...]:
+        """获取插件组件（只读元组，所有实例共享）"""
+        return _plugin_components()
@@ -0,0 +1,31 @@
+"""pytest 配置
+
+将插件根目录加入 sys.path（仅在收集阶段执行一次），
+使测试模块可以直接 ``from utils.time_utils import ...``，
+并提供共享的模拟目标 fixture。
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+plugin_dir = str(Path(__file__).resolve().parent.parent)
+if plugin_dir not in sys.path:
+    sys.path.insert(0, plugin_dir)
+
+
+class MockGoal:
+    """模拟 Goal 对象"""
+
+    def __init__(self, name: str, time_window: list = None, conditions: dict = None):
+        self.name = name
+        self.description = f"{name}活动"
+        self.parameters = {"time_window": time_window} if time_window else {}
+        self.conditions = conditions or {}
+
+
+@pytest.fixture
+def make_goal():
+    """模拟目标工厂，每次调用返回新的目标"""
+    return MockGoal
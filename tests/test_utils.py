@@ -3,106 +3,170 @@
 测试 utils/time_utils.py 和 tools.py 中的辅助函数
 """
 
-import unittest
+import ast
+import importlib
 import sys
 from pathlib import Path
 
-# 添加父目录到路径
-plugin_dir = Path(__file__).parent.parent
-sys.path.insert(0, str(plugin_dir))
+import pytest
 
-# 导入被测模块
+# 导入被测模块（utils 没有 __init__.py，只会加载 time_utils.py 本身）
+import utils.time_utils
 from utils.time_utils import (
     parse_time_window,
     parse_time_slot,
     time_slot_to_minutes,
     format_minutes_to_time,
     get_time_window_from_goal,
+    get_goal_time_window,
 )
 
 
-class TestParseTimeWindow(unittest.TestCase):
+@pytest.mark.parametrize("inp,expected", [
+    ([540, 630], (540, 630)),   # 有效的列表格式 [start, end]
+    (None, (None, None)),       # None 输入
+    ([], (None, None)),         # 空列表
+    ([540], (None, None)),      # 单元素列表
+    ([9, 17], (540, 1020)),     # 旧格式（小时）迁移为分钟
+    ([23, 1], (1380, 1500)),    # 旧格式跨夜窗口
+])
+def test_parse_time_window(inp, expected):
     """测试 parse_time_window 函数"""
+    assert parse_time_window(inp) == expected
+
+
+def test_parse_time_window_invalid_is_shared_pair():
+    """测试无效输入返回共享的 (None, None) 哨兵"""
+    from utils.time_utils import _NONE_PAIR
+
+    assert parse_time_window(None) is _NONE_PAIR
+    assert parse_time_slot("invalid") is _NONE_PAIR
+
+
+@pytest.mark.parametrize("inp,expected", [
+    ("09:30", (9, 30)),       # 标准 HH:MM
+    ("9:5", (9, 5)),          # 非标准宽度
+    ("09:30:00", (9, 30)),    # 带秒
+    ("09", (9, 0)),           # 只有小时
+    ("ab:cd", (None, None)),  # 非数字
+    (None, (None, None)),     # 非字符串输入
+])
+def test_parse_time_slot(inp, expected):
+    """测试 parse_time_slot 函数"""
+    assert parse_time_slot(inp) == expected
+
+
+@pytest.mark.parametrize("inp,expected", [
+    ("09:30", 570),       # 有效时间
+    ("00:00", 0),         # 午夜
+    ("23:59", 1439),      # 一天结束
+    ("invalid", None),    # 无效格式
+    ("0930", None),       # 缺少冒号
+    ("9:30", 570),        # 一位数小时
+    ("09", 540),          # 只有小时
+    ("09:30:00", 570),    # 带秒（秒忽略）
+    (" 9:30", 570),       # 前导空白
+    ("09:30 ", 570),      # 尾随空白
+    (None, None),         # 非字符串输入
+    (["09:30"], None),    # 不可哈希类型
+])
+def test_time_slot_to_minutes(inp, expected):
+    """测试 time_slot_to_minutes 函数"""
+    assert time_slot_to_minutes(inp) == expected
+
+
+@pytest.mark.parametrize("inp,expected", [
+    (570, "09:30"),       # 正常时间
+    (0, "00:00"),         # 午夜
+    (1439, "23:59"),      # 一天结束
+    (1500, "25:00"),      # 超出一天范围（跨夜窗口结束时间）
+    (2880, "48:00"),      # 查表范围上限
+    (2881, "48:01"),      # 超出查表范围
+])
+def test_format_minutes_to_time(inp, expected):
+    """测试 format_minutes_to_time 函数"""
+    assert format_minutes_to_time(inp) == expected
 
-    def test_valid_list_format(self):
-        """测试有效的列表格式 [start, end]"""
-        result = parse_time_window([540, 630])
-        self.assertEqual(result, (540, 630))
 
-    def test_none_input(self):
-        """测试 None 输入"""
-        result = parse_time_window(None)
-        self.assertEqual(result, (None, None))
+def test_get_goal_time_window_from_parameters(make_goal):
+    """测试 get_goal_time_window 从 parameters 读取"""
+    goal = make_goal("学习", [540, 630])
+    assert get_goal_time_window(goal) == [540, 630]
 
-    def test_empty_list(self):
-        """测试空列表"""
-        result = parse_time_window([])
-        self.assertEqual(result, (None, None))
 
-    def test_single_element_list(self):
-        """测试单元素列表"""
-        result = parse_time_window([540])
-        self.assertEqual(result, (None, None))
+def test_get_goal_time_window_fallback_to_conditions(make_goal):
+    """测试 parameters 中没有时回退到 conditions"""
+    goal = make_goal("学习", conditions={"time_window": [600, 660]})
+    assert get_goal_time_window(goal) == [600, 660]
 
 
-class TestTimeSlotToMinutes(unittest.TestCase):
-    """测试 time_slot_to_minutes 函数"""
+def test_get_goal_time_window_missing(make_goal):
+    """测试没有时间窗口"""
+    goal = make_goal("学习")
+    assert get_goal_time_window(goal) is None
 
-    def test_valid_time(self):
-        """测试有效时间"""
-        result = time_slot_to_minutes("09:30")
-        self.assertEqual(result, 570)
 
-    def test_midnight(self):
-        """测试午夜"""
-        result = time_slot_to_minutes("00:00")
-        self.assertEqual(result, 0)
+@pytest.fixture
+def goal_class():
+    """真实的 planner.goal_manager.Goal
 
-    def test_end_of_day(self):
-        """测试一天结束"""
-        result = time_slot_to_minutes("23:59")
-        self.assertEqual(result, 1439)
+    goal_manager 使用相对导入并依赖宿主的 src 包，需以插件包的形式导入；
+    宿主不可用时跳过。
+    """
+    pytest.importorskip("src.common.logger")
+    plugin_path = Path(utils.time_utils.__file__).resolve().parent.parent
+    if str(plugin_path.parent) not in sys.path:
+        sys.path.insert(0, str(plugin_path.parent))
+    return importlib.import_module(f"{plugin_path.name}.planner.goal_manager").Goal
 
-    def test_invalid_format(self):
-        """测试无效格式"""
-        result = time_slot_to_minutes("invalid")
-        self.assertIsNone(result)
 
-    def test_missing_colon(self):
-        """测试缺少冒号"""
-        result = time_slot_to_minutes("0930")
-        # "0930" 会被解析为 0小时930分钟 = 55800分钟（不正确但这是实际行为）
-        self.assertEqual(result, 55800)
+def _new_goal(goal_class, parameters):
+    return goal_class(
+        goal_id="g1", name="学习", description="学习活动", goal_type="study",
+        priority="medium", creator_id="user", chat_id="chat", parameters=parameters,
+    )
 
 
-class TestFormatMinutesToTime(unittest.TestCase):
-    """测试 format_minutes_to_time 函数"""
+def test_goal_time_window(goal_class):
+    """测试从真实 Goal 对象读取时间窗口（旧格式小时自动迁移）"""
+    goal = _new_goal(goal_class, {"time_window": [9, 10]})
+    assert get_time_window_from_goal(goal) == (540, 600)
+
 
-    def test_normal_time(self):
-        """测试正常时间"""
-        result = format_minutes_to_time(570)
-        self.assertEqual(result, "09:30")
+@pytest.mark.parametrize("attr", ["parameters", "conditions"])
+def test_goal_time_window_fresh_after_in_place_mutation(goal_class, attr):
+    """测试原地修改 parameters / conditions 后读取到的是新的时间窗口"""
+    goal = _new_goal(goal_class, {})
+    getattr(goal, attr)["time_window"] = [540, 630]
+    assert get_time_window_from_goal(goal) == (540, 630)
 
-    def test_midnight(self):
-        """测试午夜"""
-        result = format_minutes_to_time(0)
-        self.assertEqual(result, "00:00")
+    getattr(goal, attr)["time_window"] = [600, 660]
+    assert get_time_window_from_goal(goal) == (600, 660)
 
-    def test_end_of_day(self):
-        """测试一天结束"""
-        result = format_minutes_to_time(1439)
-        self.assertEqual(result, "23:59")
 
+def test_get_time_window_from_goal_plain_object():
+    """测试没有缓存属性的对象回退到直接解析"""
+    class Plain:
+        parameters = {"time_window": [9, 10]}
 
-class MockGoal:
-    """模拟 Goal 对象"""
+    assert get_time_window_from_goal(Plain()) == (540, 600)
 
-    def __init__(self, name: str, time_window: list = None):
-        self.name = name
-        self.description = f"{name}活动"
-        self.parameters = {"time_window": time_window} if time_window else {}
 
+def test_get_time_window_from_goal_default_when_missing(make_goal):
+    """测试没有时间窗口时返回默认值"""
+    assert get_time_window_from_goal(make_goal("学习")) == (0, 60)
 
-if __name__ == "__main__":
-    unittest.main()
 
+def test_time_utils_has_no_plugin_imports():
+    """测试 time_utils 只依赖标准库，测试收集不会连带加载插件其他模块"""
+    tree = ast.parse(open(utils.time_utils.__file__, encoding="utf-8").read())
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom):
+            assert node.level == 0, f"time_utils 不应使用相对导入: {ast.unparse(node)}"
+            modules = [node.module]
+        elif isinstance(node, ast.Import):
+            modules = [alias.name for alias in node.names]
+        else:
+            continue
+        for module in modules:
+            assert module.split(".")[0] in sys.stdlib_module_names, module
@@ -1,14 +1,27 @@
 """工具模块
 
 提供LLM可调用的工具。
+
+工具类按需加载（PEP 562），首次访问时才导入 .tools 模块及其依赖。
 """
 
-from .tools import (
-    ManageGoalTool,
-    GetPlanningStatusTool,
-    GenerateScheduleTool,
-    ApplyScheduleTool
-)
+_LAZY_TOOLS = frozenset({
+    "ManageGoalTool",
+    "GetPlanningStatusTool",
+    "GenerateScheduleTool",
+    "ApplyScheduleTool",
+})
+
+
+def __getattr__(name):
+    """首次访问工具类时导入并缓存到模块命名空间"""
+    if name in _LAZY_TOOLS:
+        from . import tools as _tools
+        obj = getattr(_tools, name)
+        globals()[name] = obj
+        return obj
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "ManageGoalTool",
@@ -10,21 +10,51 @@
 """
 
 import json
-from typing import Dict, Any, Optional, List, Tuple
+import re
+from typing import Callable, Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
 
+try:
+    import orjson  # 可选依赖：更快的 JSON 解析
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import fastjsonschema  # 可选依赖：预编译参数 schema，校验由生成的直线代码完成
+except ImportError:
+    fastjsonschema = None
+
 from src.plugin_system import BaseTool
 from src.llm_models.payload_content.tool_option import ToolParamType
 from src.common.logger import get_logger
 
-from ..planner.goal_manager import get_goal_manager, GoalPriority, GoalStatus
-from ..planner.schedule_generator import ScheduleGenerator, ScheduleType
+from ..planner.goal_manager import _GOAL_PRIORITY_BY_VALUE, get_goal_manager, GoalStatus
+from ..planner.schedule_generator import Schedule, ScheduleGenerator, ScheduleItem, ScheduleType
 from ..core.exceptions import InvalidParametersError, InvalidTimeWindowError
-from ..core.parameter_validator import ParameterValidator
+from ..core.parameter_validator import MAX_TIME_MINUTES, MIN_TIME_MINUTES, ParameterValidator
+from ..utils.time_utils import get_goal_time_window
 from ..utils.timezone_manager import TimezoneManager
 
 logger = get_logger("autonomous_planning.tools")
 
+# 目标名称/描述中禁止出现的片段（防注入），合并为单个正则一次扫描
+_DANGEROUS_PATTERNS: Tuple[str, ...] = ("<script>", "{{", "}}", "${", "$(", "`")
+_DANGEROUS_RE = re.compile("|".join(map(re.escape, _DANGEROUS_PATTERNS)))
+
+# 固定内容的错误响应，直接复用同一对象（调用方只读取，请勿原地修改）
+_ERR_NO_GOAL_ID: Dict[str, str] = {"type": "error", "content": "需要提供goal_id"}
+_ERR_NEED_NAME_DESC: Dict[str, str] = {"type": "error", "content": "创建目标需要提供name和description"}
+_ERR_NAME_TOO_LONG: Dict[str, str] = {"type": "error", "content": "目标名称过长（最多100字符）"}
+_ERR_DESC_TOO_LONG: Dict[str, str] = {"type": "error", "content": "目标描述过长（最多500字符）"}
+_ERR_BAD_TIME_WINDOW: Dict[str, str] = {"type": "error", "content": "时间窗口格式错误，应为'HH:MM-HH:MM'"}
+_ERR_DEADLINE_NOT_POSITIVE: Dict[str, str] = {"type": "error", "content": "截止时间必须大于0小时"}
+_ERR_DEADLINE_TOO_FAR: Dict[str, str] = {"type": "error", "content": "截止时间不能超过10年"}
+_ERR_GOAL_DELETED: Dict[str, str] = {"type": "error", "content": "目标已被删除"}
+_ERR_UPDATE_FAILED: Dict[str, str] = {"type": "error", "content": "更新失败"}
+_ERR_DELETE_FAILED: Dict[str, str] = {"type": "error", "content": "删除失败"}
+_ERR_NO_SCHEDULE_DATA: Dict[str, str] = {"type": "error", "content": "需要提供schedule_data"}
+
 
 def _parse_json_parameters(raw_params: Any) -> Dict[str, Any]:
     """解析JSON参数（字符串或字典）。
@@ -35,14 +65,17 @@ def _parse_json_parameters(raw_params: Any) -> Dict[str, Any]:
     Returns:
         解析后的字典
     """
-    if isinstance(raw_params, str):
+    # 未提供参数（None / "" / {}）时无需解析
+    if not raw_params:
+        return {}
+    if isinstance(raw_params, dict):
+        return raw_params
+    if isinstance(raw_params, (str, bytes, bytearray)):
         try:
-            return json.loads(raw_params)
-        except json.JSONDecodeError:
+            return _json_loads(raw_params)
+        except ValueError:  # json.JSONDecodeError 与 orjson.JSONDecodeError 均为其子类
             logger.warning(f"无法解析参数JSON: {raw_params}")
             return {}
-    elif isinstance(raw_params, dict):
-        return raw_params
     return {}
 
 
@@ -68,6 +101,83 @@ def _parse_time_window_str(time_window_str: str) -> Optional[List[int]]:
         return None
 
 
+# learn_topic 的 depth 取值（元组保持错误提示中的顺序，frozenset 用于成员判断）
+_DEPTH_CHOICES: Tuple[str, ...] = ("basic", "intermediate", "advanced")
+_VALID_DEPTHS = frozenset(_DEPTH_CHOICES)
+
+# 与 _check_parameters_schema 规则一致的 JSON Schema（draft-04：integer 不接受 1.0 这类浮点数）
+_BASE_PARAMETERS_SCHEMA: Dict[str, Any] = {
+    "$schema": "http://json-schema.org/draft-04/schema#",
+    "type": "object",
+    "properties": {
+        "time_window": {
+            "type": "array",
+            "minItems": 2,
+            "maxItems": 2,
+            "items": [
+                {"type": "integer", "minimum": MIN_TIME_MINUTES, "maximum": MAX_TIME_MINUTES - 1},
+                {"type": "integer", "minimum": MIN_TIME_MINUTES + 1, "maximum": MAX_TIME_MINUTES},
+            ],
+        },
+        "check_plugins": {"type": "boolean"},
+        "greeting_type": {"type": "string"},
+    },
+}
+
+_LEARN_TOPIC_PARAMETERS_SCHEMA: Dict[str, Any] = {
+    "$schema": "http://json-schema.org/draft-04/schema#",
+    "allOf": [
+        _BASE_PARAMETERS_SCHEMA,
+        {
+            "required": ["topics", "depth"],
+            "properties": {
+                "topics": {"type": "array", "minItems": 1, "items": {"type": "string"}},
+                "depth": {"enum": list(_DEPTH_CHOICES)},
+            },
+        },
+    ],
+}
+
+
+def _compile_parameter_validators() -> Optional[Dict[Optional[str], Callable[[Any], Any]]]:
+    """预编译参数校验函数（fastjsonschema 未安装时返回 None）
+
+    Returns:
+        {goal_type: validator}，键 None 对应通用校验
+    """
+    if fastjsonschema is None:
+        return None
+    base = fastjsonschema.compile(_BASE_PARAMETERS_SCHEMA)
+    return {
+        None: base,
+        "learn_topic": fastjsonschema.compile(_LEARN_TOPIC_PARAMETERS_SCHEMA),
+    }
+
+
+_PARAMETER_VALIDATORS = _compile_parameter_validators()
+
+
+def _passes_compiled_schema(params: Any, goal_type: Optional[str]) -> bool:
+    """用预编译校验函数快速判断参数是否合法
+
+    JSON Schema 无法表达的规则（必须是 list 而非 tuple、起始时间小于结束时间）在此补充检查。
+    返回 False 不代表一定非法，只表示需要走逐项检查以给出准确的错误信息。
+    """
+    validator = _PARAMETER_VALIDATORS.get(goal_type, _PARAMETER_VALIDATORS[None])
+    try:
+        validator(params)
+    except fastjsonschema.JsonSchemaException:
+        return False
+
+    if "time_window" in params:
+        time_window = params["time_window"]
+        if time_window.__class__ is not list or time_window[0] >= time_window[1]:
+            return False
+    if goal_type == "learn_topic" and params["topics"].__class__ is not list:
+        return False
+    return True
+
+
 def _validate_parameters_schema(params: Dict[str, Any], goal_type: str = None) -> Tuple[bool, Optional[str]]:
     """验证目标参数的schema结构。
 
@@ -88,6 +198,34 @@ def _validate_parameters_schema(params: Dict[str, Any], goal_type: str = None) -
         - check_plugins: 必须是布尔值（health_check类型建议）
         - greeting_type: 必须是字符串（social_maintenance类型建议）
     """
+    # 未提供任何参数：只有 learn_topic 有必填字段
+    if params.__class__ is dict and not params:
+        if goal_type == "learn_topic":
+            raise InvalidParametersError(
+                "learn_topic类型的目标必须包含topics参数",
+                field_name="topics"
+            )
+        return True, None
+
+    # 合法参数（绝大多数调用）走预编译校验，不通过时再逐项检查以抛出准确的错误
+    if _PARAMETER_VALIDATORS is not None and _passes_compiled_schema(params, goal_type):
+        return True, None
+
+    _check_parameters_schema(params, goal_type)
+    return True, None
+
+
+def _check_parameters_schema(params: Dict[str, Any], goal_type: str = None) -> None:
+    """逐项验证目标参数，第一个不合法的字段抛出对应异常。
+
+    Args:
+        params: 要验证的参数字典
+        goal_type: 目标类型（用于特定验证）
+
+    Raises:
+        InvalidParametersError: 参数验证失败时
+        InvalidTimeWindowError: time_window 不合法时
+    """
     if not isinstance(params, dict):
         raise InvalidParametersError("参数必须是字典类型", invalid_value=type(params).__name__)
 
@@ -135,10 +273,9 @@ def _validate_parameters_schema(params: Dict[str, Any], goal_type: str = None) -
                 field_name="depth",
                 invalid_value=depth
             )
-        valid_depths = ["basic", "intermediate", "advanced"]
-        if depth not in valid_depths:
+        if depth not in _VALID_DEPTHS:
             raise InvalidParametersError(
-                f"depth必须是以下之一: {valid_depths}，当前: {depth}",
+                f"depth必须是以下之一: {list(_DEPTH_CHOICES)}，当前: {depth}",
                 field_name="depth",
                 invalid_value=depth
             )
@@ -163,7 +300,57 @@ def _validate_parameters_schema(params: Dict[str, Any], goal_type: str = None) -
                 invalid_value=greeting_type
             )
 
-    return True, None
+
+def _build_schedule_config(tool: BaseTool) -> Dict[str, Any]:
+    """读取日程生成相关配置，组装为 ScheduleGenerator 的配置字典。
+
+    Args:
+        tool: 提供 get_config 的工具实例
+
+    Returns:
+        日程生成配置字典
+    """
+    get_config = tool.get_config
+    return {
+        "use_multi_round": get_config("autonomous_planning.schedule.use_multi_round", True),
+        "max_rounds": get_config("autonomous_planning.schedule.max_rounds", 2),
+        "quality_threshold": get_config("autonomous_planning.schedule.quality_threshold", 0.85),
+        "min_activities": get_config("autonomous_planning.schedule.min_activities", 8),
+        "max_activities": get_config("autonomous_planning.schedule.max_activities", 15),
+        "enable_detailed_description": get_config("autonomous_planning.schedule.enable_detailed_description", True),
+        "min_description_length": get_config("autonomous_planning.schedule.min_description_length", 20),
+        "max_description_length": get_config("autonomous_planning.schedule.max_description_length", 50),
+        "max_tokens": get_config("autonomous_planning.schedule.max_tokens", 8192),
+        "custom_prompt": get_config("autonomous_planning.schedule.custom_prompt", ""),
+        "custom_model": {
+            "enabled": get_config("autonomous_planning.schedule.custom_model.enabled", False),
+            "model_name": get_config("autonomous_planning.schedule.custom_model.model_name", ""),
+            "api_base": get_config("autonomous_planning.schedule.custom_model.api_base", ""),
+            "api_key": get_config("autonomous_planning.schedule.custom_model.api_key", ""),
+            "provider": get_config("autonomous_planning.schedule.custom_model.provider", "openai"),
+            "temperature": get_config("autonomous_planning.schedule.custom_model.temperature", 0.7),
+        },
+    }
+
+
+# 状态变更操作: action -> (GoalManager 方法名, 成功类型, 成功提示, 失败提示)
+_SIMPLE_GOAL_ACTIONS: Dict[str, Tuple[str, str, str, str]] = {
+    "pause": ("pause_goal", "goal_paused", "⏸️ 目标已暂停", "暂停失败"),
+    "resume": ("resume_goal", "goal_resumed", "▶️ 目标已恢复", "恢复失败"),
+    "complete": ("complete_goal", "goal_completed", "✅ 目标已完成！", "完成失败"),
+    "cancel": ("cancel_goal", "goal_cancelled", "❌ 目标已取消", "取消失败"),
+}
+
+
+# 需要提供 goal_id 的操作
+_GOAL_ID_ACTIONS = frozenset({"get", "update", "delete", *_SIMPLE_GOAL_ACTIONS})
+
+# 成功响应的内容模板（绑定 str.format，仅目标信息部分随调用变化）
+_CREATE_OK_TEMPLATE: Callable[..., str] = "✅ 目标创建成功！\n\n{}\n\n麦麦会自动执行这个目标~".format
+_DELETE_OK_TEMPLATE: Callable[..., str] = "🗑️ 已删除目标: {}".format
+
+# 日程类型取值到枚举的查找表（按值构造枚举需经过 EnumMeta.__call__）
+_SCHEDULE_TYPE_BY_VALUE: Dict[str, ScheduleType] = {member.value: member for member in ScheduleType}
 
 
 class ManageGoalTool(BaseTool):
@@ -192,53 +379,68 @@ class ManageGoalTool(BaseTool):
             chat_id = function_args.get("_chat_id", "default")
             user_id = function_args.get("_user_id", "system")
 
+            # 针对单个目标的操作统一校验 goal_id
+            goal_id = function_args.get("goal_id")
+            if not goal_id and action in _GOAL_ID_ACTIONS:
+                return _ERR_NO_GOAL_ID
+
+            # 只需 goal_id 的状态变更操作：查表分派
+            simple_action = _SIMPLE_GOAL_ACTIONS.get(action)
+            if simple_action is not None:
+                method_name, success_type, success_content, failure_content = simple_action
+                success = getattr(goal_manager, method_name)(goal_id)
+                return {
+                    "type": success_type if success else "error",
+                    "content": success_content if success else failure_content
+                }
+
             if action == "create":
                 name = function_args.get("name")
                 description = function_args.get("description")
 
                 if not name or not description:
-                    return {"type": "error", "content": "创建目标需要提供name和description"}
+                    return _ERR_NEED_NAME_DESC
 
                 # P0修复：输入验证 - 长度限制
                 if len(name) > 100:
-                    return {"type": "error", "content": "目标名称过长（最多100字符）"}
+                    return _ERR_NAME_TOO_LONG
                 if len(description) > 500:
-                    return {"type": "error", "content": "目标描述过长（最多500字符）"}
+                    return _ERR_DESC_TOO_LONG
+
+                # 截止时间范围检查开销最小，先于内容扫描与JSON解析执行
+                deadline_hours = function_args.get("deadline_hours")
+                if deadline_hours is not None:
+                    if deadline_hours <= 0:
+                        return _ERR_DEADLINE_NOT_POSITIVE
+                    if deadline_hours > 87600:  # 10年
+                        return _ERR_DEADLINE_TOO_FAR
 
                 # P0修复：输入验证 - 特殊字符过滤（防注入）
-                dangerous_patterns = ["<script>", "{{", "}}", "${", "$(", "`"]
-                for pattern in dangerous_patterns:
-                    if pattern in name or pattern in description:
-                        return {"type": "error", "content": f"输入包含非法字符: {pattern}"}
+                if _DANGEROUS_RE.search(name) or _DANGEROUS_RE.search(description):
+                    # 命中时按列表顺序报告第一个出现的片段（与逐个检查的结果一致）
+                    pattern = next(p for p in _DANGEROUS_PATTERNS if p in name or p in description)
+                    return {"type": "error", "content": f"输入包含非法字符: {pattern}"}
 
                 goal_type = function_args.get("goal_type", "custom")
                 priority = function_args.get("priority", "medium")
                 time_window_str = function_args.get("time_window")
-                deadline_hours = function_args.get("deadline_hours")
 
                 # 解析时间窗口
                 time_window = None
                 if time_window_str:
                     time_window = _parse_time_window_str(time_window_str)
                     if time_window is None:
-                        return {
-                            "type": "error",
-                            "content": "时间窗口格式错误，应为'HH:MM-HH:MM'"
-                        }
-
-                if deadline_hours is not None:
-                    if deadline_hours <= 0:
-                        return {"type": "error", "content": "截止时间必须大于0小时"}
-                    if deadline_hours > 87600:  # 10年
-                        return {"type": "error", "content": "截止时间不能超过10年"}
+                        return _ERR_BAD_TIME_WINDOW
 
                 # 解析parameters参数
-                parameters = _parse_json_parameters(function_args.get("parameters", {}))
+                parameters = _parse_json_parameters(function_args.get("parameters"))
 
                 # 计算时间 - 使用时区感知时间
                 timezone_str = self.get_config("autonomous_planning.schedule.timezone", "Asia/Shanghai")
                 tz_manager = TimezoneManager(timezone_str)
-                deadline = tz_manager.get_now() + timedelta(hours=deadline_hours) if deadline_hours else None
+                # 当前时间只取一次，同一次调用内的时间戳保持一致
+                now = tz_manager.get_now()
+                deadline = now + timedelta(seconds=deadline_hours * 3600.0) if deadline_hours else None
 
                 # 将time_window存入parameters
                 if time_window:
@@ -265,23 +467,13 @@ class ManageGoalTool(BaseTool):
                     parameters=parameters,
                 )
 
-                content = f"""✅ 目标创建成功！
-
-{goal.get_summary()}
-
-麦麦会自动执行这个目标~"""
-
-                return {"type": "goal_created", "id": goal.goal_id, "content": content}
+                return {"type": "goal_created", "id": goal.goal_id, "content": _CREATE_OK_TEMPLATE(goal.get_summary())}
 
             elif action == "list":
                 summary = goal_manager.get_goals_summary(chat_id=chat_id)
                 return {"type": "goal_list", "content": summary}
 
             elif action == "get":
-                goal_id = function_args.get("goal_id")
-                if not goal_id:
-                    return {"type": "error", "content": "需要提供goal_id"}
-
                 goal = goal_manager.get_goal(goal_id)
                 if not goal:
                     return {"type": "error", "content": f"目标不存在: {goal_id}"}
@@ -289,29 +481,22 @@ class ManageGoalTool(BaseTool):
                 return {"type": "goal_info", "content": goal.get_summary()}
 
             elif action == "update":
-                goal_id = function_args.get("goal_id")
-                if not goal_id:
-                    return {"type": "error", "content": "需要提供goal_id"}
-
                 update_params = {}
                 if "name" in function_args:
                     update_params["name"] = function_args["name"]
                 if "description" in function_args:
                     update_params["description"] = function_args["description"]
                 if "priority" in function_args:
-                    update_params["priority"] = GoalPriority(function_args["priority"])
+                    try:
+                        update_params["priority"] = _GOAL_PRIORITY_BY_VALUE[function_args["priority"]]
+                    except (KeyError, TypeError):
+                        return {"type": "error", "content": f"无效的优先级: {function_args['priority']}"}
                 if "time_window" in function_args:
                     tw = _parse_time_window_str(function_args["time_window"])
                     if tw is None:
-                        return {
-                            "type": "error",
-                            "content": "时间窗口格式错误，应为'HH:MM-HH:MM'"
-                        }
-                    goal = goal_manager.get_goal(goal_id)
-                    if goal:
-                        params = goal.parameters.copy() if goal.parameters else {}
-                        params["time_window"] = tw
-                        update_params["parameters"] = params
+                        return _ERR_BAD_TIME_WINDOW
+                    # 只合并 time_window，由数据库原地更新，无需先读取并复制原参数
+                    update_params["parameters_patch"] = {"time_window": tw}
                 if "parameters" in function_args:
                     update_params["parameters"] = _parse_json_parameters(
                         function_args["parameters"]
@@ -324,63 +509,18 @@ class ManageGoalTool(BaseTool):
                     if goal:
                         return {"type": "goal_updated", "content": f"✅ 目标已更新\n\n{goal.get_summary()}"}
                     else:
-                        return {"type": "error", "content": "目标已被删除"}
+                        return _ERR_GOAL_DELETED
                 else:
-                    return {"type": "error", "content": "更新失败"}
-
-            elif action == "pause":
-                goal_id = function_args.get("goal_id")
-                if not goal_id:
-                    return {"type": "error", "content": "需要提供goal_id"}
-                success = goal_manager.pause_goal(goal_id)
-                return {
-                    "type": "goal_paused" if success else "error",
-                    "content": "⏸️ 目标已暂停" if success else "暂停失败"
-                }
-
-            elif action == "resume":
-                goal_id = function_args.get("goal_id")
-                if not goal_id:
-                    return {"type": "error", "content": "需要提供goal_id"}
-                success = goal_manager.resume_goal(goal_id)
-                return {
-                    "type": "goal_resumed" if success else "error",
-                    "content": "▶️ 目标已恢复" if success else "恢复失败"
-                }
-
-            elif action == "complete":
-                goal_id = function_args.get("goal_id")
-                if not goal_id:
-                    return {"type": "error", "content": "需要提供goal_id"}
-                success = goal_manager.complete_goal(goal_id)
-                return {
-                    "type": "goal_completed" if success else "error",
-                    "content": "✅ 目标已完成！" if success else "完成失败"
-                }
-
-            elif action == "cancel":
-                goal_id = function_args.get("goal_id")
-                if not goal_id:
-                    return {"type": "error", "content": "需要提供goal_id"}
-                success = goal_manager.cancel_goal(goal_id)
-                return {
-                    "type": "goal_cancelled" if success else "error",
-                    "content": "❌ 目标已取消" if success else "取消失败"
-                }
+                    return _ERR_UPDATE_FAILED
 
             elif action == "delete":
-                goal_id = function_args.get("goal_id")
-                if not goal_id:
-                    return {"type": "error", "content": "需要提供goal_id"}
                 goal = goal_manager.get_goal(goal_id)
                 if not goal:
                     return {"type": "error", "content": f"目标不存在: {goal_id}"}
                 goal_name = goal.name
-                success = goal_manager.delete_goal(goal_id)
-                return {
-                    "type": "goal_deleted" if success else "error",
-                    "content": f"🗑️ 已删除目标: {goal_name}" if success else "删除失败"
-                }
+                if not goal_manager.delete_goal(goal_id):
+                    return _ERR_DELETE_FAILED
+                return {"type": "goal_deleted", "content": _DELETE_OK_TEMPLATE(goal_name)}
 
             else:
                 return {"type": "error", "content": f"未知操作: {action}"}
@@ -390,6 +530,10 @@ class ManageGoalTool(BaseTool):
             return {"type": "error", "content": f"操作失败: {str(e)}"}
 
 
+_WEEKDAY_NAMES = ("周一", "周二", "周三", "周四", "周五", "周六", "周日")
+_STATUS_DETAIL_HINT = " | 详情: detailed=true"
+
+
 class GetPlanningStatusTool(BaseTool):
     """获取规划状态工具 - 查看今日日程（简洁格式）"""
 
@@ -423,29 +567,17 @@ class GetPlanningStatusTool(BaseTool):
 
             current_minutes = now.hour * 60 + now.minute
 
-            # 提取时间窗口并排序
-            schedule_with_time = []
-            for goal in schedule_goals:
-                time_window = None
-                if goal.parameters and "time_window" in goal.parameters:
-                    time_window = goal.parameters["time_window"]
-                elif goal.conditions and "time_window" in goal.conditions:
-                    time_window = goal.conditions["time_window"]
-
-                if time_window and isinstance(time_window, list) and len(time_window) == 2:
-                    schedule_with_time.append((goal, time_window))
-
-            # 按时间排序
-            schedule_with_time.sort(key=lambda x: x[1][0])
-
-            # 分类日程
+            # 提取时间窗口并分类日程（单次遍历）
             ongoing = []  # 正在进行
             upcoming = []  # 即将到来
             completed = []  # 已完成
 
-            for goal, time_window in schedule_with_time:
-                start_min, end_min = time_window
+            for goal in schedule_goals:
+                time_window = get_goal_time_window(goal)
+                if not (time_window and isinstance(time_window, list) and len(time_window) == 2):
+                    continue
 
+                start_min, end_min = time_window
                 if start_min <= current_minutes <= end_min:
                     ongoing.append((goal, time_window))
                 elif current_minutes < start_min:
@@ -453,11 +585,14 @@ class GetPlanningStatusTool(BaseTool):
                 else:  # current_minutes > end_min
                     completed.append((goal, time_window))
 
+            # 各分类分别按开始时间排序（稳定排序，与先整体排序再分类的结果一致）
+            for bucket in (ongoing, upcoming, completed):
+                bucket.sort(key=lambda x: x[1][0])
+
             # 构建简洁日程
             def format_time(minutes):
                 """将分钟数转换为时间字符串"""
-                h = minutes // 60
-                m = minutes % 60
+                h, m = divmod(minutes, 60)
                 return f"{h:02d}:{m:02d}"
 
             def format_schedule_item(goal, time_window, status_emoji=""):
@@ -478,37 +613,33 @@ class GetPlanningStatusTool(BaseTool):
                 else:
                     return f"{status_emoji}{start_time}-{end_time} {goal.name}"
 
-            # 构建输出
-            date_str = now.strftime("%Y-%m-%d")
-            weekday_names = ["周一", "周二", "周三", "周四", "周五", "周六", "周日"]
-            weekday = weekday_names[now.weekday()]
-
-            content = f"📅 今日日程 {date_str} {weekday}\n"
+            # 构建输出：各段收集到列表中，最后一次性拼接
+            parts = [f"📅 今日日程 {now.strftime('%Y-%m-%d')} {_WEEKDAY_NAMES[now.weekday()]}\n"]
 
             if ongoing:
-                content += "\n🔵 正在进行:\n"
+                parts.append("\n🔵 正在进行:\n")
                 for goal, time_window in ongoing:
-                    content += format_schedule_item(goal, time_window, "▶️ ") + "\n"
+                    parts.append(format_schedule_item(goal, time_window, "▶️ ") + "\n")
 
             if upcoming:
-                content += "\n⏰ 即将到来:\n"
+                parts.append("\n⏰ 即将到来:\n")
                 for goal, time_window in upcoming[:5]:  # 最多显示5个
-                    content += format_schedule_item(goal, time_window) + "\n"
+                    parts.append(format_schedule_item(goal, time_window) + "\n")
 
                 if len(upcoming) > 5:
-                    content += f"   ...还有 {len(upcoming) - 5} 个活动\n"
+                    parts.append(f"   ...还有 {len(upcoming) - 5} 个活动\n")
 
             if completed and detailed:
-                content += "\n✅ 已完成:\n"
+                parts.append("\n✅ 已完成:\n")
                 for goal, time_window in completed[-3:]:  # 只显示最近3个
-                    content += format_schedule_item(goal, time_window) + "\n"
+                    parts.append(format_schedule_item(goal, time_window) + "\n")
 
             # 统计信息
-            content += f"\n📊 共 {len(schedule_goals)} 个活动"
+            parts.append(f"\n📊 共 {len(schedule_goals)} 个活动")
             if not detailed:
-                content += " | 详情: detailed=true"
+                parts.append(_STATUS_DETAIL_HINT)
 
-            return {"type": "planning_status", "content": content}
+            return {"type": "planning_status", "content": "".join(parts)}
 
         except Exception as e:
             logger.error(f"获取规划状态失败: {e}", exc_info=True)
@@ -530,35 +661,16 @@ class GenerateScheduleTool(BaseTool):
         """生成并应用日程"""
         try:
             schedule_type_str = function_args.get("schedule_type", "daily")
+            schedule_type = _SCHEDULE_TYPE_BY_VALUE.get(schedule_type_str)
+            if schedule_type is None:
+                return {"type": "error", "content": f"未知的日程类型: {schedule_type_str}"}
             auto_apply = function_args.get("auto_apply", True)
             chat_id = "global"  # 全局日程
             user_id = function_args.get("_user_id", "system")
 
             goal_manager = get_goal_manager()
 
-            # 读取配置并传给ScheduleGenerator
-            schedule_config = {
-                "use_multi_round": self.get_config("autonomous_planning.schedule.use_multi_round", True),
-                "max_rounds": self.get_config("autonomous_planning.schedule.max_rounds", 2),
-                "quality_threshold": self.get_config("autonomous_planning.schedule.quality_threshold", 0.85),
-                "min_activities": self.get_config("autonomous_planning.schedule.min_activities", 8),
-                "max_activities": self.get_config("autonomous_planning.schedule.max_activities", 15),
-                "enable_detailed_description": self.get_config("autonomous_planning.schedule.enable_detailed_description", True),
-                "min_description_length": self.get_config("autonomous_planning.schedule.min_description_length", 20),
-                "max_description_length": self.get_config("autonomous_planning.schedule.max_description_length", 50),
-                "max_tokens": self.get_config("autonomous_planning.schedule.max_tokens", 8192),
-                "custom_prompt": self.get_config("autonomous_planning.schedule.custom_prompt", ""),
-                "custom_model": {
-                    "enabled": self.get_config("autonomous_planning.schedule.custom_model.enabled", False),
-                    "model_name": self.get_config("autonomous_planning.schedule.custom_model.model_name", ""),
-                    "api_base": self.get_config("autonomous_planning.schedule.custom_model.api_base", ""),
-                    "api_key": self.get_config("autonomous_planning.schedule.custom_model.api_key", ""),
-                    "provider": self.get_config("autonomous_planning.schedule.custom_model.provider", "openai"),
-                    "temperature": self.get_config("autonomous_planning.schedule.custom_model.temperature", 0.7),
-                },
-            }
-            schedule_generator = ScheduleGenerator(goal_manager, config=schedule_config)
-            schedule_type = ScheduleType(schedule_type_str)
+            schedule_generator = ScheduleGenerator(goal_manager, config=_build_schedule_config(self))
 
             if schedule_type == ScheduleType.DAILY:
                 schedule = await schedule_generator.generate_daily_schedule(
@@ -612,6 +724,10 @@ class GenerateScheduleTool(BaseTool):
             return {"type": "error", "content": f"生成日程失败: {str(e)}"}
 
 
+# 日程项必需字段
+_SCHEDULE_ITEM_REQUIRED_KEYS: Tuple[str, ...] = ("name", "description", "goal_type", "priority")
+
+
 class ApplyScheduleTool(BaseTool):
     """应用日程工具 - 将日程项转换为可执行目标"""
 
@@ -625,55 +741,43 @@ class ApplyScheduleTool(BaseTool):
     async def execute(self, function_args: Dict[str, Any]) -> Dict[str, Any]:
         """应用日程并创建目标"""
         try:
-            schedule_data = function_args.get("schedule_data")
+            schedule_data = _parse_json_parameters(function_args.get("schedule_data"))
             if not schedule_data:
-                return {"type": "error", "content": "需要提供schedule_data"}
+                return _ERR_NO_SCHEDULE_DATA
+            schedule_type = _SCHEDULE_TYPE_BY_VALUE.get(schedule_data.get("schedule_type"))
+            if schedule_type is None:
+                return {"type": "error", "content": f"未知的日程类型: {schedule_data.get('schedule_type')}"}
 
             chat_id = "global"  # 全局日程
             user_id = function_args.get("_user_id", "system")
 
             goal_manager = get_goal_manager()
 
-            # 读取配置并传给ScheduleGenerator
-            schedule_config = {
-                "use_multi_round": self.get_config("autonomous_planning.schedule.use_multi_round", True),
-                "max_rounds": self.get_config("autonomous_planning.schedule.max_rounds", 2),
-                "quality_threshold": self.get_config("autonomous_planning.schedule.quality_threshold", 0.85),
-                "min_activities": self.get_config("autonomous_planning.schedule.min_activities", 8),
-                "max_activities": self.get_config("autonomous_planning.schedule.max_activities", 15),
-                "enable_detailed_description": self.get_config("autonomous_planning.schedule.enable_detailed_description", True),
-                "min_description_length": self.get_config("autonomous_planning.schedule.min_description_length", 20),
-                "max_description_length": self.get_config("autonomous_planning.schedule.max_description_length", 50),
-                "max_tokens": self.get_config("autonomous_planning.schedule.max_tokens", 8192),
-                "custom_prompt": self.get_config("autonomous_planning.schedule.custom_prompt", ""),
-                "custom_model": {
-                    "enabled": self.get_config("autonomous_planning.schedule.custom_model.enabled", False),
-                    "model_name": self.get_config("autonomous_planning.schedule.custom_model.model_name", ""),
-                    "api_base": self.get_config("autonomous_planning.schedule.custom_model.api_base", ""),
-                    "api_key": self.get_config("autonomous_planning.schedule.custom_model.api_key", ""),
-                    "provider": self.get_config("autonomous_planning.schedule.custom_model.provider", "openai"),
-                    "temperature": self.get_config("autonomous_planning.schedule.custom_model.temperature", 0.7),
-                },
-            }
-            schedule_generator = ScheduleGenerator(goal_manager, config=schedule_config)
-
-            # 重建Schedule对象
-            from .planner.schedule_generator import ScheduleItem, Schedule
-            items = []
-            for item_data in schedule_data.get("items", []):
-                items.append(ScheduleItem(
+            schedule_generator = ScheduleGenerator(goal_manager, config=_build_schedule_config(self))
+
+            # 重建Schedule对象（先整体校验结构，再一次性构建日程项）
+            item_datas = schedule_data.get("items", ())
+            for index, item_data in enumerate(item_datas, 1):
+                if not isinstance(item_data, dict) or not all(key in item_data for key in _SCHEDULE_ITEM_REQUIRED_KEYS):
+                    return {"type": "error", "content": f"第{index}个日程项缺少必需字段: {', '.join(_SCHEDULE_ITEM_REQUIRED_KEYS)}"}
+
+            schedule_item = ScheduleItem
+            items = [
+                schedule_item(
                     name=item_data["name"],
                     description=item_data["description"],
                     goal_type=item_data["goal_type"],
                     priority=item_data["priority"],
                     time_slot=item_data.get("time_slot"),
                     duration_hours=item_data.get("duration_hours"),
-                    parameters=item_data.get("parameters", {}),
-                    conditions=item_data.get("conditions", {}),
-                ))
+                    parameters=item_data.get("parameters"),
+                    conditions=item_data.get("conditions"),
+                )
+                for item_data in item_datas
+            ]
 
             schedule = Schedule(
-                schedule_type=ScheduleType(schedule_data["schedule_type"]),
+                schedule_type=schedule_type,
                 name=schedule_data["name"],
                 items=items
             )
@@ -7,15 +7,16 @@ Features:
     - Winter-themed visual design with snowflakes and gradients
     - Font caching for improved performance
     - Image resource caching and reuse
-    - Concurrent generation limiting (max 3 simultaneous)
+    - Concurrent generation limiting (max 3 simultaneous, fewer under tight cgroup memory limits)
     - Resolution limiting to prevent OOM
     - Activity status indicators (current/completed/upcoming)
     - Automatic highlighting of current/next activity
 
 Performance Optimizations:
     - Cached font loading
+    - Cached text masks for repeatedly drawn strings
     - Pre-processed character images
-    - Semaphore-based concurrency control
+    - Semaphore-based concurrency control (asyncio semaphore for async callers)
     - Memory-efficient image composition
 
 Example:
@@ -27,35 +28,622 @@ Example:
     ...     {"time": "10:00-11:00", "name": "Study time",
     ...      "description": "Read a book", "goal_type": "study"}
     ... ]
-    >>> path, base64_str = ScheduleImageGenerator.generate_schedule_image(
+    >>> result = ScheduleImageGenerator.generate_schedule_image(
     ...     title="Today's Schedule",
     ...     schedule_items=items
     ... )
+    >>> path, jpeg_bytes = result   # tuple unpacking and indexing work
+    >>> result.base64               # the base64 string is only built on access
 """
 
-import base64
+import asyncio
+import binascii
+import bisect
 import io
 import math
 import os
 import random
+import re
+import shutil
+import subprocess
+import sys
 import threading
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
+from itertools import accumulate
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
-from PIL import Image, ImageDraw, ImageFont
+import PIL
+from PIL import Image, ImageChops, ImageDraw, ImageFilter, ImageFont
 
 from src.common.logger import get_logger
+from ..cache import LRUCache
 from .timezone_manager import TimezoneManager
 
 logger = get_logger("autonomous_planning.schedule_image_generator")
 
+# Pillow-SIMD（版本号带 .postN 后缀）对 alpha 合成与缩放做了 SSE4/AVX2 加速，可直接替换 Pillow
+if ".post" not in PIL.__version__:
+    logger.debug(f"当前使用 Pillow {PIL.__version__}，安装 Pillow-SIMD 可加速日程图片合成")
+
+# 候选字体路径（按平台区分，按优先级排列）；导入时只保留当前平台的候选，探测时不再检查其他平台的路径
+if sys.platform == "darwin":
+    _FONT_PATHS: Tuple[str, ...] = ("/System/Library/Fonts/PingFang.ttc",)
+elif sys.platform == "win32":
+    _FONT_PATHS = ("C:/Windows/Fonts/msyh.ttc",)
+else:
+    _FONT_PATHS = (
+        # 优先使用支持数字和符号的字体
+        "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",  # ✅ 支持中文+数字
+        "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",  # ✅ 支持中文+数字
+        "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
+        "/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc",
+        "/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf",  # ⚠️ 数字显示为方块，作为后备
+    )
+
+# 🔧 修复：同时测试中文、数字和符号（日程图片需要显示时间）
+_FONT_TEST_TEXT = "测试2025-11-18 09:30"
+
+# 日程时间段 "HH:MM-HH:MM"（允许一位数小时/分钟及分隔符两侧的空白）
+_TIME_RANGE_PATTERN = re.compile(r"\s*([0-9]{1,2})\s*:\s*([0-9]{1,2})\s*-\s*([0-9]{1,2})\s*:\s*([0-9]{1,2})\s*")
+
+# 卡片底色（卡片背景近乎不透明，其上的元素可视为画在该纯色上）
+_CARD_FILL_RGB: Tuple[int, int, int] = (250, 252, 255)
+
+
+def _blend_over(color: Tuple[int, int, int], alpha: int, background: Tuple[int, int, int]) -> Tuple[int, int, int]:
+    """预先计算半透明颜色叠加在纯色背景上的结果，绘制时可直接使用不透明颜色
+
+    Args:
+        color: 前景颜色
+        alpha: 前景透明度（0-255）
+        background: 背景颜色
+
+    Returns:
+        混合后的 RGB 颜色
+    """
+    return tuple(round((c * alpha + b * (255 - alpha)) / 255) for c, b in zip(color, background))
+
+
+# 冬季角色透明度查找表（alpha 乘以 0.65）
+_WINTER_CHAR_ALPHA_LUT: List[int] = [int(p * 0.65) for p in range(256)]
+
+# 雪花六条主干的单位向量及各自 ±30° 分叉的单位向量（角度固定，预先计算三角函数）
+_SNOWFLAKE_RAYS: Tuple[Tuple[float, float, Tuple[Tuple[float, float], ...]], ...] = tuple(
+    (
+        math.cos(math.radians(angle)),
+        math.sin(math.radians(angle)),
+        tuple(
+            (math.cos(math.radians(angle + branch)), math.sin(math.radians(angle + branch)))
+            for branch in (-30, 30)
+        ),
+    )
+    for angle in range(0, 360, 60)
+)
+
+
+def _font_renders_test_text(path: str) -> bool:
+    """检查字体文件能否正常渲染测试文字（中文、数字和符号）"""
+    try:
+        test_bbox = ImageFont.truetype(path, 16).getbbox(_FONT_TEST_TEXT)
+        return test_bbox[2] - test_bbox[0] > 0
+    except Exception as e:
+        logger.debug(f"加载字体失败: {path} - {e}")
+        return False
+
+
+def _fontconfig_font_path() -> Optional[str]:
+    """通过 fontconfig 查询系统中的中文字体（候选路径都不可用时的后备，仅 Linux 等装有 fc-match 的系统）
+
+    Returns:
+        字体文件路径，fontconfig 不可用或查询失败时返回 None
+    """
+    fc_match = shutil.which("fc-match")
+    if fc_match is None:
+        return None
+    try:
+        result = subprocess.run(
+            [fc_match, "-f", "%{file}", ":lang=zh"],
+            capture_output=True, text=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"fontconfig 查询字体失败: {e}")
+        return None
+    return result.stdout.strip() or None
+
+
+@lru_cache(maxsize=None)
+def _resolve_font_path() -> Optional[str]:
+    """查找第一个可用的字体路径
+
+    只在首次调用时探测文件系统并测试渲染，之后所有字号共用该路径；
+    候选路径都不可用时再向 fontconfig 查询一次。找不到字体的结果同样被缓存，
+    之后的调用不再重复探测。
+
+    Returns:
+        字体文件路径，没有可用字体时返回 None
+    """
+    for path in _FONT_PATHS:
+        if os.path.exists(path) and _font_renders_test_text(path):
+            logger.info(f"已选定字体: {path}")
+            return path
+
+    path = _fontconfig_font_path()
+    if path and _font_renders_test_text(path):
+        logger.info(f"已选定字体（fontconfig）: {path}")
+        return path
+
+    logger.warning("未找到可用的中文字体")
+    return None
+
+
+@lru_cache(maxsize=None)
+def _load_font(size: int) -> ImageFont.FreeTypeFont:
+    """按字号加载字体（进程内缓存，每个字号只打开一次字体文件）"""
+    path = _resolve_font_path()
+    if path is None:
+        raise RuntimeError("未找到可用的中文字体")
+    return ImageFont.truetype(path, size)
+
+
+@dataclass(frozen=True)
+class _FontSizes:
+    """按画布宽度缩放后的各级字号"""
+    title: int   # 标题与卡片图标
+    text: int    # 日程名称
+    time: int    # 时间段
+    small: int   # 副标题、描述、状态与签名
+
+
+@lru_cache(maxsize=8)
+def _font_sizes(width: int) -> _FontSizes:
+    """计算画布宽度对应的字号（按宽度缓存，每次生成只计算一次后传给各绘制步骤）"""
+    font_scale = width / 1280
+    return _FontSizes(
+        title=int(40 * font_scale),
+        text=int(21 * font_scale),
+        time=int(19 * font_scale),
+        small=int(16 * font_scale),
+    )
+
+
+@lru_cache(maxsize=8)
+def _gradient_column(height: int) -> Image.Image:
+    """背景渐变的 1 像素宽颜色列（按高度缓存，只读）
+
+    画布高度由少数几种宽度决定，缓存后重复生成图片时不再逐行计算颜色。
+
+    Args:
+        height: 画布高度
+
+    Returns:
+        尺寸为 (1, height) 的 RGB 图像
+    """
+    ratios = [y / height for y in range(height)]
+    # 每个通道一次生成整列字节，再由 Pillow 合并为 RGB
+    channels = [
+        Image.frombytes('L', (1, height), bytes([int(top - span * ratio) for ratio in ratios]))
+        for top, span in ((240, 25), (245, 20), (252, 10))
+    ]
+    return Image.merge('RGB', channels)
+
+
+@lru_cache(maxsize=8)
+def _title_halo_sprite(font_scale: float) -> Tuple[Image.Image, int]:
+    """预渲染标题头像的光晕（按缩放比例缓存，只读）
+
+    在小尺寸透明图上画一个椭圆再高斯模糊成柔和的光晕，绘制标题时只需一次粘贴。
+
+    Args:
+        font_scale: 缩放比例（画布宽度 / 1280）
+
+    Returns:
+        (光晕图像, 外边距)，外边距即光晕相对头像区域向外扩展的像素数
+    """
+    margin = int(55 * font_scale)
+    avatar_width = int(160 * font_scale) - int(70 * font_scale)
+    avatar_height = int(90 * font_scale)
+    size = (avatar_width + 2 * margin + 1, avatar_height + 2 * margin + 1)
+
+    # 椭圆向外扩展半个外边距，再以 1/4 外边距为半径模糊，光晕在外边距内衰减到透明
+    spread = margin // 2
+    sprite = Image.new('RGBA', size, (180, 210, 255, 0))
+    ImageDraw.Draw(sprite).ellipse(
+        [margin - spread, margin - spread, margin + avatar_width + spread, margin + avatar_height + spread],
+        fill=(180, 210, 255, 200)
+    )
+    return sprite.filter(ImageFilter.GaussianBlur(margin / 4)), margin
+
+
+@lru_cache(maxsize=256)
+def _parse_time_range(time_str: str) -> Tuple[int, int]:
+    """ScheduleImageGenerator._parse_time_str 的缓存实现（仅接受字符串）"""
+    # 一次预编译正则匹配代替多次 split 与 strip，不符合 HH:MM-HH:MM 形式的返回 (0, 0)
+    match = _TIME_RANGE_PATTERN.fullmatch(time_str)
+    if match is None:
+        return (0, 0)
+    start_hour, start_minute, end_hour, end_minute = map(int, match.groups())
+    return (start_hour * 60 + start_minute, end_hour * 60 + end_minute)
+
+
+def _draw_snowflake(draw: ImageDraw.ImageDraw, x: float, y: float, size: float, color: Tuple[int, ...]):
+    """绘制雪花（主干与分叉方向取自预先计算的单位向量表）"""
+    branch_size = size * 0.4
+    for cos_a, sin_a, branches in _SNOWFLAKE_RAYS:
+        draw.line([(x, y), (x + size * cos_a, y + size * sin_a)], fill=color, width=2)
+
+        branch_x = x + size * 0.6 * cos_a
+        branch_y = y + size * 0.6 * sin_a
+        for cos_b, sin_b in branches:
+            draw.line(
+                [(branch_x, branch_y), (branch_x + branch_size * cos_b, branch_y + branch_size * sin_b)],
+                fill=color,
+                width=1,
+            )
+
+
+@lru_cache(maxsize=16)
+def _card_tile(
+    card_width: int, card_height: int, color: Tuple[int, int, int], highlighted: bool
+) -> Tuple[Image.Image, int]:
+    """预渲染日程卡片底板：高亮光晕、阴影、圆角背景、左侧渐变条与右上角雪花（按参数缓存，只读）
+
+    只在卡片大小（含光晕外边距）的图块上绘制，每张卡片只需一次粘贴；
+    同色卡片在多次生成之间复用同一图块。
+
+    Args:
+        card_width: 卡片宽度
+        card_height: 卡片高度
+        color: 卡片主题色
+        highlighted: 是否为高亮的目标卡片（带光晕，边框更粗）
+
+    Returns:
+        (RGBA 图块, 外边距)，图块左上角相对卡片左上角向外偏移外边距像素
+    """
+    shadow_offset = 12  # 阴影相对卡片的偏移
+    shadow_blur = 4  # 阴影模糊半径
+    shadow_extent = shadow_offset + 3 * shadow_blur  # 阴影模糊后的最远延伸
+    margin = 50 if highlighted else 0  # 最外层光晕的外扩
+    far_extent = max(shadow_extent, margin)
+    size = (margin + card_width + far_extent + 1, margin + card_height + far_extent + 1)
+    tile = Image.new('RGBA', size, (0, 0, 0, 0))
+
+    # 目标高亮光晕：卡片形状的圆角矩形高斯模糊后向外扩散
+    if highlighted:
+        spread = margin // 2
+        glow = Image.new('RGBA', size, (150, 220, 255, 0))
+        ImageDraw.Draw(glow).rounded_rectangle(
+            (margin - spread, margin - spread, margin + card_width + spread, margin + card_height + spread),
+            radius=26 + spread,
+            fill=(150, 220, 255, 230)
+        )
+        tile.alpha_composite(glow.filter(ImageFilter.GaussianBlur(margin / 4)))
+
+    # 阴影：偏移的圆角矩形模糊一次
+    shadow = Image.new('RGBA', size, (180, 200, 220, 0))
+    offset = margin + shadow_offset
+    ImageDraw.Draw(shadow).rounded_rectangle(
+        (offset, offset, card_width + offset, card_height + offset),
+        radius=26,
+        fill=(180, 200, 220, 110)
+    )
+    tile.alpha_composite(shadow.filter(ImageFilter.GaussianBlur(shadow_blur)))
+
+    # 卡片背景
+    layer = Image.new('RGBA', size, (0, 0, 0, 0))
+    ImageDraw.Draw(layer).rounded_rectangle(
+        (margin, margin, margin + card_width, margin + card_height),
+        radius=26,
+        fill=(*_CARD_FILL_RGB, 250),
+        outline=color,
+        width=5 if highlighted else 4
+    )
+    tile.alpha_composite(layer)
+
+    # 左侧渐变条（不透明，直接覆盖）：先生成一行 18 像素的颜色，再纵向拉伸到条的高度
+    row = bytearray()
+    for i in range(18):
+        gradient_ratio = i / 18
+        row += bytes((
+            int(color[0] * (1 - gradient_ratio * 0.2)),
+            int(color[1] * (1 - gradient_ratio * 0.2)),
+            int(color[2] * (1 - gradient_ratio * 0.1)),
+            255,
+        ))
+    bar = Image.frombytes('RGBA', (18, 1), bytes(row)).resize((18, card_height - 51), Image.NEAREST)
+    tile.paste(bar, (margin, margin + 26))
+
+    # 右上角装饰雪花（半透明，画在单独图层上再合成，避免直接覆盖卡片像素的透明度）
+    layer = Image.new('RGBA', size, (0, 0, 0, 0))
+    _draw_snowflake(ImageDraw.Draw(layer), margin + card_width - 35, margin + 25, 8, (*color, 180))
+    tile.alpha_composite(layer)
+    return tile, margin
+
+
+@lru_cache(maxsize=16)
+def _status_tag_sprite(
+    text: str,
+    glow_color: Tuple[int, int, int],
+    bg_color: Tuple[int, int, int],
+    highlighted: bool,
+    size: int
+) -> Tuple[Image.Image, int]:
+    """预渲染状态标签：椭圆底色、白色文字，高亮时带光晕（按样式与字号缓存，只读）
+
+    状态只有三种，每种样式的标签只绘制一次，之后每张卡片只需一次粘贴。
+
+    Args:
+        text: 状态文字
+        glow_color: 光晕颜色
+        bg_color: 底色（不透明）
+        highlighted: 是否为高亮目标卡片的标签
+        size: 文字字号
+
+    Returns:
+        (RGBA 图块, 外边距)，图块左上角相对标签左上角向外偏移外边距像素
+    """
+    margin = 18 if highlighted else 0  # 最外层光晕的外扩
+    sprite_size = (100 + 2 * margin + 1, 40 + 2 * margin + 1)
+    sprite = Image.new('RGBA', sprite_size, (0, 0, 0, 0))
+
+    if highlighted:
+        for i in range(4):
+            glow_size = i * 6
+            layer = Image.new('RGBA', sprite_size, (0, 0, 0, 0))
+            ImageDraw.Draw(layer).ellipse(
+                [margin - glow_size, margin - glow_size,
+                 margin + 100 + glow_size, margin + 40 + glow_size],
+                fill=(*glow_color, 60 - i * 14)
+            )
+            sprite.alpha_composite(layer)
+
+    ImageDraw.Draw(sprite).ellipse([margin, margin, margin + 100, margin + 40], fill=bg_color)
+    # 描边与正文同为白色，三次绘制合并为一次
+    _draw_text(sprite, (margin + 20, margin + 10), text, (255, 255, 255), size, ((1, 0), (0, 1), (0, 0)))
+    return sprite, margin
+
+
+@lru_cache(maxsize=64)
+def _measure_text(size: int, text: str) -> Tuple[int, int]:
+    """测量文字在指定字号下的宽高（缓存结果，固定文案每个字号只测量一次）
+
+    Args:
+        size: 字号
+        text: 文字内容
+
+    Returns:
+        (宽度, 高度)
+    """
+    bbox = _load_font(size).getbbox(text)
+    return bbox[2] - bbox[0], bbox[3] - bbox[1]
+
+
+@lru_cache(maxsize=4096)
+def _char_width(size: int, char: str) -> float:
+    """单个字符在指定字号下的前进宽度（缓存）"""
+    return _load_font(size).getlength(char)
+
+
+@lru_cache(maxsize=1024)
+def _text_mask(size: int, text: str) -> Tuple[Image.Image, int, int]:
+    """渲染文字的灰度蒙版（缓存，同一文字在同一字号下只排版光栅化一次）
+
+    卡片上的名称、时间、图标等会以不同偏移和颜色重复绘制多次（阴影效果），
+    复用蒙版即可省去重复的排版与光栅化。蒙版只读，可在多次绘制间共享。
+
+    Args:
+        size: 字号
+        text: 文字内容
+
+    Returns:
+        (蒙版图像, 左偏移, 上偏移)
+    """
+    font = _load_font(size)
+    left, top, right, bottom = font.getbbox(text)
+    mask = Image.new('L', (max(right - left, 1), max(bottom - top, 1)), 0)
+    ImageDraw.Draw(mask).text((-left, -top), text, fill=255, font=font)
+    return mask, left, top
+
+
+@lru_cache(maxsize=512)
+def _text_group_mask(size: int, text: str, offsets: Tuple[Tuple[int, int], ...]) -> Tuple[Image.Image, int, int]:
+    """把同一文字在多个偏移处的蒙版合并为一张（缓存，只读）
+
+    以 screen 方式合并，与按同一颜色依次绘制各偏移的叠加结果一致。
+
+    Args:
+        size: 字号
+        text: 文字内容
+        offsets: 各次绘制相对 xy 的偏移
+
+    Returns:
+        (合并后的蒙版, 左偏移, 上偏移)
+    """
+    mask, left, top = _text_mask(size, text)
+    min_dx = min(dx for dx, _ in offsets)
+    min_dy = min(dy for _, dy in offsets)
+    group_size = (
+        mask.width + max(dx for dx, _ in offsets) - min_dx,
+        mask.height + max(dy for _, dy in offsets) - min_dy,
+    )
+    group = Image.new('L', group_size, 0)
+    for dx, dy in offsets:
+        layer = Image.new('L', group_size, 0)
+        layer.paste(mask, (dx - min_dx, dy - min_dy))
+        group = ImageChops.screen(group, layer)
+    return group, left + min_dx, top + min_dy
+
+
+def _draw_text(
+    img: Image.Image,
+    xy: Tuple[int, int],
+    text: str,
+    fill: Tuple[int, ...],
+    size: int,
+    offsets: Tuple[Tuple[int, int], ...] = ((0, 0),)
+):
+    """用缓存的文字蒙版在图像上绘制文字（等价于 ImageDraw.text）
+
+    Args:
+        img: 目标图像
+        xy: 文字左上角坐标
+        text: 文字内容
+        fill: 文字颜色
+        size: 字号
+        offsets: 同色重复绘制的偏移列表（如描边阴影），合并为一次粘贴
+    """
+    if not text:
+        return
+    if len(offsets) == 1 and offsets[0] == (0, 0):
+        mask, left, top = _text_mask(size, text)
+    else:
+        mask, left, top = _text_group_mask(size, text, offsets)
+    img.paste(fill, (int(xy[0]) + left, int(xy[1]) + top), mask)
+
+
+@lru_cache(maxsize=256)
+def _shadowed_text_sprite(
+    size: int,
+    text: str,
+    fill: Tuple[int, int, int],
+    shadow_fill: Tuple[int, int, int],
+    offsets: Tuple[Tuple[int, int], ...]
+) -> Tuple[Image.Image, int, int]:
+    """预渲染带阴影的文字精灵图（缓存，只读）
+
+    阴影与文字合成到同一张透明小图上，卡片图标、时间、名称每处只需一次粘贴；
+    图标只有十几种，时间与名称在重复生成同一日程时也会命中缓存。
+
+    Args:
+        size: 字号
+        text: 文字内容
+        fill: 文字颜色
+        shadow_fill: 阴影颜色
+        offsets: 阴影相对文字的偏移列表
+
+    Returns:
+        (精灵图, 左偏移, 上偏移)
+    """
+    shadow_mask, shadow_left, shadow_top = _text_group_mask(size, text, offsets)
+    mask, left, top = _text_mask(size, text)
+    x0, y0 = min(shadow_left, left), min(shadow_top, top)
+    sprite_size = (
+        max(shadow_left + shadow_mask.width, left + mask.width) - x0,
+        max(shadow_top + shadow_mask.height, top + mask.height) - y0,
+    )
+    shadow = Image.new('RGBA', sprite_size, shadow_fill + (0,))
+    shadow.paste(shadow_fill + (255,), (shadow_left - x0, shadow_top - y0), shadow_mask)
+    foreground = Image.new('RGBA', sprite_size, fill + (0,))
+    foreground.paste(fill + (255,), (left - x0, top - y0), mask)
+    return Image.alpha_composite(shadow, foreground), x0, y0
+
+
+def _draw_shadowed_text(
+    img: Image.Image,
+    xy: Tuple[int, int],
+    text: str,
+    fill: Tuple[int, int, int],
+    shadow_fill: Tuple[int, int, int],
+    size: int,
+    offsets: Tuple[Tuple[int, int], ...]
+):
+    """用缓存的精灵图绘制带阴影的文字（等价于先画阴影再画文字）
+
+    Args:
+        img: 目标图像
+        xy: 文字左上角坐标
+        text: 文字内容
+        fill: 文字颜色
+        shadow_fill: 阴影颜色
+        size: 字号
+        offsets: 阴影相对文字的偏移列表
+    """
+    if not text:
+        return
+    sprite, left, top = _shadowed_text_sprite(size, text, fill, shadow_fill, offsets)
+    img.paste(sprite, (int(xy[0]) + left, int(xy[1]) + top), sprite)
+
+
+def _fit_text(size: int, text: str, max_width: float) -> str:
+    """截断过长的文字使其不超过 max_width，超出部分以省略号结尾
+
+    先整体测量一次，放得下直接返回；否则累加缓存的单字宽度得到前缀和，
+    用二分查找定位截断位置，不再对逐渐变长的前缀反复排版测量。
+
+    Args:
+        size: 字号
+        text: 文字内容
+        max_width: 最大宽度（像素）
+
+    Returns:
+        原文字或截断后的文字
+    """
+    if not text or _load_font(size).getlength(text) <= max_width:
+        return text
+    prefix_widths = list(accumulate(_char_width(size, char) for char in text))
+    cut = bisect.bisect_right(prefix_widths, max_width - _char_width(size, "…"))
+    return text[:cut] + "…"
+
+
+class ScheduleImageResult(NamedTuple):
+    """日程图片生成结果
+
+    即 (图片路径, JPEG字节) 元组，可解包、索引，也可按字段名访问；
+    base64 字符串在访问 base64 属性时才编码，只需要路径的调用方不承担编码开销。
+    """
+
+    path: str
+    data: bytes  # JPEG 数据
+
+    @property
+    def base64(self) -> str:
+        """JPEG 数据的 base64 编码（每次访问时编码，需要多次使用时请保存结果）"""
+        return binascii.b2a_base64(self.data, newline=False).decode('ascii')
+
+
+# 并发生成数上限，以及按内存估算并发数时每个生成任务预留的内存（1080p 画布、编码缓冲与临时图层，留有余量）
+_MAX_GENERATION_PERMITS = 3
+_GENERATION_MEMORY_BUDGET = 60 * 1024 * 1024
+
+# cgroup 内存上限文件（v2 / v1）
+_CGROUP_MEMORY_LIMIT_FILES = (
+    "/sys/fs/cgroup/memory.max",
+    "/sys/fs/cgroup/memory/memory.limit_in_bytes",
+)
+
+
+def _detect_generation_permits() -> int:
+    """根据容器内存上限确定并发生成数（导入时调用一次）
+
+    读取 cgroup v2/v1 的内存上限，按每个生成任务的内存预算换算；
+    未设置内存上限（或非 Linux 容器）时沿用原有默认值：不超过 CPU 核数的3个。结果限制在 1~3 之间。
+
+    Returns:
+        并发生成数
+    """
+    for path in _CGROUP_MEMORY_LIMIT_FILES:
+        try:
+            with open(path, encoding="ascii") as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        # v2 的 "max" 与 v1 的超大数值都表示不限制
+        if value.isdigit() and int(value) < (1 << 62):
+            return max(1, min(_MAX_GENERATION_PERMITS, int(value) // _GENERATION_MEMORY_BUDGET))
+        break
+    return max(1, min(_MAX_GENERATION_PERMITS, os.cpu_count() or _MAX_GENERATION_PERMITS))
+
 
 class ScheduleImageGenerator:
     """生成日程图片"""
 
-    # P2优化：并发限制（最多3个并发生成）
-    _generation_semaphore = threading.Semaphore(3)
+    # P2优化：并发限制（最多3个并发生成，容器内存受限时按内存上限减少）
+    GENERATION_PERMITS = _detect_generation_permits()
+    _generation_semaphore = threading.Semaphore(GENERATION_PERMITS)
+    # 异步调用方在事件循环中排队，不让等待中的请求占用线程池线程
+    _async_generation_semaphore = asyncio.Semaphore(GENERATION_PERMITS)
 
     # 插件根目录（使用相对路径）
     PLUGIN_ROOT = Path(__file__).parent.parent
@@ -79,11 +667,24 @@ class ScheduleImageGenerator:
         "custom": "◈",
     }
 
+    # 活动状态标签样式：状态 -> (文字, 光晕颜色, 底色)
+    # 底色为 240 透明度的主题色预先混合到卡片底色上的结果，绘制时无需逐像素混合
+    STATUS_STYLES = {
+        "current": ("进行中", (100, 200, 255), _blend_over((100, 200, 255), 240, _CARD_FILL_RGB)),
+        "completed": ("已完成", (180, 220, 255), _blend_over((180, 220, 255), 240, _CARD_FILL_RGB)),
+        "upcoming": ("未开始", (200, 210, 255), _blend_over((200, 210, 255), 240, _CARD_FILL_RGB)),
+    }
+
     # ===== 性能优化：缓存机制 =====
     _cached_bird_image = None
-    _cached_winter_char = None
     _cached_winter_char_alpha = None  # 预处理后的透明角色
-    _cached_fonts = {}  # 字体缓存 {size: font}
+    _cached_bird_avatars = {}  # 圆形头像缓存 {size: image}
+    _cached_base_canvases = {}  # 基础画布缓存 {(width, height): image}
+
+    # 生成结果缓存：短时间内相同输入（同一分钟内状态不变）直接复用已编码的JPEG
+    RESULT_CACHE_SIZE = 8
+    RESULT_CACHE_TTL = 60  # 秒
+    _result_cache = LRUCache(max_size=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL)
 
     @classmethod
     def _load_images(cls):
@@ -95,14 +696,14 @@ class ScheduleImageGenerator:
                 logger.warning(f"加载鸟图片失败: {e}")
                 cls._cached_bird_image = Image.new('RGBA', (100, 100), (255, 150, 80, 255))
 
-        if cls._cached_winter_char is None:
+        if cls._cached_winter_char_alpha is None:
             try:
                 winter_char = Image.open(cls.WINTER_CHAR_IMAGE_PATH).convert('RGBA')
                 # 预处理：调整大小和透明度（缩小以适应720p）
                 winter_char_resized = winter_char.resize((367, 533))  # 从550x800缩小
                 # 使用PIL的内置方法调整透明度，比逐像素快得多
-                alpha = winter_char_resized.split()[3]  # 获取alpha通道
-                alpha = alpha.point(lambda p: int(p * 0.65))  # 批量处理透明度
+                alpha = winter_char_resized.getchannel('A')  # 只取alpha通道，不拆分全部通道
+                alpha = alpha.point(_WINTER_CHAR_ALPHA_LUT)  # 查找表直接走C实现，无需Python回调
                 winter_char_resized.putalpha(alpha)
                 cls._cached_winter_char_alpha = winter_char_resized
             except (FileNotFoundError, IOError) as e:
@@ -112,109 +713,62 @@ class ScheduleImageGenerator:
         return cls._cached_bird_image, cls._cached_winter_char_alpha
 
     @classmethod
-    def _get_font(cls, size: int) -> ImageFont.FreeTypeFont:
-        """获取字体（带缓存）"""
-        # 检查缓存
-        if size in cls._cached_fonts:
-            return cls._cached_fonts[size]
-
-        font_paths = [
-            # 优先使用支持数字和符号的字体
-            "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",  # ✅ 支持中文+数字
-            "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",  # ✅ 支持中文+数字
-            "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
-            "/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc",
-            "/System/Library/Fonts/PingFang.ttc",
-            "C:/Windows/Fonts/msyh.ttc",
-            "/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf",  # ⚠️ 数字显示为方块，作为后备
-        ]
-
-        for path in font_paths:
-            if os.path.exists(path):
-                try:
-                    font = ImageFont.truetype(path, size)
-                    # 🔧 修复：同时测试中文、数字和符号（日程图片需要显示时间）
-                    test_text = "测试2025-11-18 09:30"
-                    test_bbox = font.getbbox(test_text)
-                    if test_bbox[2] - test_bbox[0] > 0:
-                        # 缓存字体
-                        cls._cached_fonts[size] = font
-                        logger.info(f"已加载字体: {path} (size={size})")
-                        return font
-                except Exception as e:
-                    logger.debug(f"加载字体失败: {path} - {e}")
-                    continue
+    def _get_bird_avatar(cls, bird: Image.Image, size: int) -> Image.Image:
+        """获取裁剪为圆形的小鸟头像（按尺寸缓存，只读）
 
-        raise RuntimeError("未找到可用的中文字体")
+        Args:
+            bird: 鸟图片
+            size: 头像边长
 
-    @staticmethod
-    def _draw_rounded_rectangle(draw, coords, radius, fill, outline=None, width=2):
-        """绘制圆角矩形"""
-        x1, y1, x2, y2 = coords
-        if x2 <= x1 or y2 <= y1 or radius * 2 > min(x2 - x1, y2 - y1):
-            draw.rectangle([x1, y1, x2, y2], fill=fill, outline=outline, width=width)
-            return
-        draw.rectangle([x1 + radius, y1, x2 - radius, y2], fill=fill)
-        draw.rectangle([x1, y1 + radius, x2, y2 - radius], fill=fill)
-        draw.pieslice([x1, y1, x1 + radius * 2, y1 + radius * 2], 180, 270, fill=fill)
-        draw.pieslice([x2 - radius * 2, y1, x2, y1 + radius * 2], 270, 360, fill=fill)
-        draw.pieslice([x1, y2 - radius * 2, x1 + radius * 2, y2], 90, 180, fill=fill)
-        draw.pieslice([x2 - radius * 2, y2 - radius * 2, x2, y2], 0, 90, fill=fill)
-        if outline:
-            draw.arc([x1, y1, x1 + radius * 2, y1 + radius * 2], 180, 270, fill=outline, width=width)
-            draw.arc([x2 - radius * 2, y1, x2, y1 + radius * 2], 270, 360, fill=outline, width=width)
-            draw.arc([x1, y2 - radius * 2, x1 + radius * 2, y2], 90, 180, fill=outline, width=width)
-            draw.arc([x2 - radius * 2, y2 - radius * 2, x2, y2], 0, 90, fill=outline, width=width)
-            draw.line([x1 + radius, y1, x2 - radius, y1], fill=outline, width=width)
-            draw.line([x1 + radius, y2, x2 - radius, y2], fill=outline, width=width)
-            draw.line([x1, y1 + radius, x1, y2 - radius], fill=outline, width=width)
-            draw.line([x2, y1 + radius, x2, y2 - radius], fill=outline, width=width)
+        Returns:
+            RGBA 圆形头像
+        """
+        avatar = cls._cached_bird_avatars.get(size)
+        if avatar is None:
+            mask = Image.new('L', (size, size), 0)
+            ImageDraw.Draw(mask).ellipse([0, 0, size, size], fill=255)
+            avatar = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+            avatar.paste(bird.resize((size, size)), (0, 0), mask)
+            cls._cached_bird_avatars[size] = avatar
+        return avatar
 
-    @staticmethod
-    def _draw_snowflake(draw, x, y, size, color):
-        """绘制雪花"""
-        for angle in range(0, 360, 60):
-            rad = math.radians(angle)
-            end_x = x + size * math.cos(rad)
-            end_y = y + size * math.sin(rad)
-            draw.line([(x, y), (end_x, end_y)], fill=color, width=2)
-
-            branch_size = size * 0.4
-            for branch_angle in [-30, 30]:
-                branch_rad = math.radians(angle + branch_angle)
-                branch_x = x + size * 0.6 * math.cos(rad)
-                branch_y = y + size * 0.6 * math.sin(rad)
-                branch_end_x = branch_x + branch_size * math.cos(branch_rad)
-                branch_end_y = branch_y + branch_size * math.sin(branch_rad)
-                draw.line([(branch_x, branch_y), (branch_end_x, branch_end_y)], fill=color, width=1)
+    @classmethod
+    def _get_font(cls, size: int) -> ImageFont.FreeTypeFont:
+        """获取字体（带缓存，字体路径只探测一次）"""
+        return _load_font(size)
 
     @staticmethod
     def _parse_time_str(time_str: str) -> tuple:
-        """解析时间字符串，返回开始和结束的分钟数"""
-        try:
-            parts = time_str.split('-')
-            if len(parts) != 2:
-                return (0, 0)
-
-            start_time = parts[0].strip().split(':')
-            end_time = parts[1].strip().split(':')
-
-            start_minutes = int(start_time[0]) * 60 + int(start_time[1])
-            end_minutes = int(end_time[0]) * 60 + int(end_time[1])
+        """解析时间字符串，返回开始和结束的分钟数
 
-            return (start_minutes, end_minutes)
-        except (ValueError, IndexError, AttributeError):
+        同样的时间段字符串在多次生成之间反复出现，字符串结果按值缓存；
+        非字符串输入（可能不可哈希）不进入缓存。
+        """
+        if not isinstance(time_str, str):
             return (0, 0)
+        return _parse_time_range(time_str)
 
     @staticmethod
-    def _get_activity_status(time_str: str) -> str:
-        """获取活动状态: current/completed/upcoming"""
-        tz_manager = TimezoneManager()
-        now = tz_manager.get_now()
-        current_minutes = now.hour * 60 + now.minute
+    def _get_activity_status(time_str: str, current_minutes: Optional[int] = None) -> str:
+        """获取活动状态: current/completed/upcoming
+
+        Args:
+            time_str: 时间段字符串，如 "09:00-10:00"
+            current_minutes: 当前时间（从00:00开始的分钟数），None 时自动获取
+
+        Returns:
+            活动状态
+        """
+        if current_minutes is None:
+            now = TimezoneManager().get_now()
+            current_minutes = now.hour * 60 + now.minute
 
         start_minutes, end_minutes = ScheduleImageGenerator._parse_time_str(time_str)
+        return ScheduleImageGenerator._status_from_minutes(start_minutes, end_minutes, current_minutes)
 
+    @staticmethod
+    def _status_from_minutes(start_minutes: int, end_minutes: int, current_minutes: int) -> str:
+        """根据已解析的起止分钟数判断活动状态: current/completed/upcoming"""
         if start_minutes <= current_minutes < end_minutes:
             return "current"
         elif current_minutes >= end_minutes:
@@ -231,6 +785,11 @@ class ScheduleImageGenerator:
     DEFAULT_WIDTH = 1280
     DEFAULT_HEIGHT = 720
 
+    # JPEG 编码质量（平衡清晰度和文件大小）
+    JPEG_QUALITY = 85
+    # 色度子采样 4:2:0（值 2），以基线（非渐进式）方式编码，编码最快
+    JPEG_SUBSAMPLING = 2
+
     # ========================================================================
     # 🆕 重构：私有方法 - 职责单一
     # ========================================================================
@@ -245,61 +804,88 @@ class ScheduleImageGenerator:
         Returns:
             (实际宽度, 实际高度, 鸟图片, 冬季角色图片)
         """
-        # 使用默认值或限制最大分辨率
-        if width is None:
-            width = cls.DEFAULT_WIDTH
-        else:
-            width = min(width, cls.MAX_WIDTH)
-
-        # 按比例计算高度（16:9）
-        height = int(width * 9 / 16)
-        height = min(height, cls.MAX_HEIGHT)
+        # 使用默认值或限制最大分辨率，按比例计算高度（16:9）
+        width = cls.DEFAULT_WIDTH if width is None else min(width, cls.MAX_WIDTH)
+        height = min(width * 9 // 16, cls.MAX_HEIGHT)
 
         # 使用缓存加载图片资源（性能优化）
-        bird, winter_char_alpha = cls._load_images()
+        return (width, height, *cls._load_images())
+
+    @staticmethod
+    def _create_gradient_background(width: int, height: int) -> Image.Image:
+        """创建蓝白纵向渐变背景
+
+        只计算 1 像素宽的一列颜色，再由 Pillow 横向拉伸到整个画布，
+        避免逐行调用 draw.line。
+
+        Args:
+            width: 画布宽度
+            height: 画布高度
 
-        return width, height, bird, winter_char_alpha
+        Returns:
+            RGB 背景图像
+        """
+        return _gradient_column(height).resize((width, height), Image.NEAREST)
 
     @classmethod
     def _create_base_canvas(
         cls,
         width: int,
         height: int,
+        bird: Any,
         winter_char_alpha: Any
-    ) -> Tuple[Any, Any, Any]:
-        """创建基础画布：背景渐变、纹理、冬季角色、雪花
+    ) -> Tuple[Any, Any]:
+        """创建基础画布：背景渐变、纹理、冬季角色、雪花，以及标题区域中与标题文字无关的装饰
+
+        同一尺寸的基础画布只构建一次，之后每次生成只复制缓存的图像。
+
+        Args:
+            width: 画布宽度
+            height: 画布高度
+            bird: 鸟图片
+            winter_char_alpha: 冬季角色图片（已预处理）
+
+        Returns:
+            (主图像, draw对象)
+        """
+        base = cls._cached_base_canvases.get((width, height))
+        if base is None:
+            base = cls._build_base_canvas(width, height, bird, winter_char_alpha)
+            cls._cached_base_canvases[(width, height)] = base
+        img = base.copy()
+        # 以 RGBA 模式绘制：半透明图形直接与RGB主图像混合，无需单独的overlay再整图合成
+        return img, ImageDraw.Draw(img, 'RGBA')
+
+    @classmethod
+    def _build_base_canvas(cls, width: int, height: int, bird: Any, winter_char_alpha: Any) -> Image.Image:
+        """构建基础画布（纹理与雪花位置在构建时随机一次）
 
         Args:
             width: 画布宽度
             height: 画布高度
+            bird: 鸟图片
             winter_char_alpha: 冬季角色图片（已预处理）
 
         Returns:
-            (主图像, draw对象, overlay图像)
+            RGB 基础画布（缓存共享，只读）
         """
-        # 创建冬季主题背景
-        img = Image.new('RGB', (width, height), (240, 245, 252))
-        draw = ImageDraw.Draw(img)
-
-        # 蓝白渐变
-        for y in range(height):
-            ratio = y / height
-            r = int(240 - 25 * ratio)
-            g = int(245 - 20 * ratio)
-            b = int(252 - 10 * ratio)
-            draw.line([(0, y), (width, y)], fill=(r, g, b))
+        # 创建冬季主题背景（蓝白渐变）
+        img = cls._create_gradient_background(width, height)
+        draw = ImageDraw.Draw(img, 'RGBA')
 
         # 冬季纹理（减少纹理点数量，降低内存占用）
+        # 按亮度分组收集纹理点，每种亮度只调用一次 draw.point
         texture_count = int(1500 * (width / 1280))
+        randint = random.randint
+        texture_points: List[List[Tuple[int, int]]] = [[] for _ in range(21)]
         for _ in range(texture_count):
-            x = random.randint(0, width)
-            y = random.randint(0, height)
-            brightness = random.randint(-5, 15)
-            draw.point((x, y), fill=(245 + brightness, 248 + brightness, 255))
-
-        # 创建overlay对象
-        overlay = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        draw_overlay = ImageDraw.Draw(overlay)
+            x = randint(0, width)
+            y = randint(0, height)
+            texture_points[randint(-5, 15) + 5].append((x, y))
+        for index, points in enumerate(texture_points):
+            if points:
+                brightness = index - 5
+                draw.point(points, fill=(245 + brightness, 248 + brightness, 255))
 
         # 添加冬季角色（根据分辨率缩放）
         char_scale = width / 1280
@@ -323,169 +909,129 @@ class ScheduleImageGenerator:
             sx = random.randint(int(100 * char_scale), width - int(100 * char_scale))
             sy = random.randint(int(50 * char_scale), height - int(100 * char_scale))
             size = random.randint(15, 25)
-            cls._draw_snowflake(draw_overlay, sx, sy, size, (220, 235, 255, 180))
+            _draw_snowflake(draw, sx, sy, size, (220, 235, 255, 180))
 
         for _ in range(snowflake_count_small):
             sx = random.randint(int(50 * char_scale), width - int(50 * char_scale))
             sy = random.randint(0, height)
             size = random.randint(8, 14)
-            cls._draw_snowflake(draw_overlay, sx, sy, size, (230, 240, 255, 140))
+            _draw_snowflake(draw, sx, sy, size, (230, 240, 255, 140))
 
-        # 合并overlay
-        img.paste(overlay, (0, 0), overlay)
+        # 标题区域中固定不变的部分（头像、光晕、副标题、装饰线）
+        cls._draw_title_decorations(img, draw, width, bird)
 
-        return img, draw, overlay
+        return img
 
     @classmethod
     def _calculate_display_items(
         cls,
-        schedule_items: List[Dict[str, Any]]
-    ) -> Tuple[List[Dict[str, Any]], int]:
+        schedule_items: List[Dict[str, Any]],
+        current_time_minutes: int
+    ) -> Tuple[List[Dict[str, Any]], int, List[str]]:
         """计算要显示的日程项：固定显示5个，当前/下一个日程在第3个位置
 
+        每个日程项的时间字符串只解析一次，状态判断与查找下一个日程都复用解析结果；
+        状态随显示项一起返回供绘制卡片时复用。
+
         Args:
             schedule_items: 所有日程项
+            current_time_minutes: 当前时间（从00:00开始的分钟数）
 
         Returns:
-            (要显示的5个日程项, 目标索引)
+            (要显示的5个日程项, 目标索引, 显示项对应的状态)
         """
         if not schedule_items:
-            return [], -1
+            return [], -1, []
 
         # 找到当前或下一个日程的索引
-        target_index = -1
-        tz_manager = TimezoneManager()
-        now = tz_manager.get_now()
-        current_time_minutes = now.hour * 60 + now.minute
+        parsed_times = [cls._parse_time_str(item.get("time", "")) for item in schedule_items]
+        statuses = [
+            cls._status_from_minutes(start_minutes, end_minutes, current_time_minutes)
+            for start_minutes, end_minutes in parsed_times
+        ]
 
-        # 优先查找正在进行的日程
-        for idx, item in enumerate(schedule_items):
-            status = cls._get_activity_status(item.get("time", ""))
+        # 单次遍历：优先取正在进行的日程，同时记下第一个即将开始的日程
+        target_index = -1
+        upcoming_index = -1
+        for idx, status in enumerate(statuses):
             if status == "current":
                 target_index = idx
                 break
+            if upcoming_index == -1 and parsed_times[idx][0] > current_time_minutes:
+                upcoming_index = idx
 
-        # 如果没有正在进行的，找下一个即将开始的
+        # 如果没有正在进行的，使用下一个即将开始的
         if target_index == -1:
-            for idx, item in enumerate(schedule_items):
-                time_str = item.get("time", "")
-                start_minutes, _ = cls._parse_time_str(time_str)
-                if start_minutes > current_time_minutes:
-                    target_index = idx
-                    break
+            target_index = upcoming_index
 
         # 如果还是没找到，使用最后一个
         if target_index == -1:
             target_index = len(schedule_items) - 1
 
         # 固定显示5个日程
-        display_items = []
-        display_target_index = -1
-
         if len(schedule_items) <= 5:
-            display_items = schedule_items
-            display_target_index = target_index
+            start_idx = 0
+        elif target_index < 2:
+            start_idx = 0
+        elif target_index >= len(schedule_items) - 2:
+            start_idx = len(schedule_items) - 5
         else:
-            if target_index < 2:
-                display_items = schedule_items[:5]
-                display_target_index = target_index
-            elif target_index >= len(schedule_items) - 2:
-                display_items = schedule_items[-5:]
-                display_target_index = 5 - (len(schedule_items) - target_index)
-            else:
-                start_idx = target_index - 2
-                display_items = schedule_items[start_idx:start_idx + 5]
-                display_target_index = 2
-
-        return display_items, display_target_index
+            start_idx = target_index - 2
+
+        return (
+            schedule_items[start_idx:start_idx + 5],
+            target_index - start_idx,
+            statuses[start_idx:start_idx + 5],
+        )
 
     @classmethod
-    def _draw_title_area(
+    def _draw_title_decorations(
         cls,
         img: Any,
         draw: Any,
-        overlay: Any,
-        title: str,
         width: int,
-        height: int,
         bird: Any
-    ) -> Any:
-        """绘制标题区域：头像、标题、副标题、装饰线
+    ):
+        """绘制标题区域中与标题文字无关的装饰：头像、光晕、副标题、装饰线
+
+        这些内容只取决于画布宽度，随基础画布一起构建并缓存。
 
         Args:
             img: 主图像
-            draw: 绘制对象
-            overlay: overlay图像
-            title: 标题文字
+            draw: 绘制对象（RGBA模式）
             width: 画布宽度
-            height: 画布高度
             bird: 鸟图片
-
-        Returns:
-            更新后的overlay对象
         """
         font_scale = width / 1280
-        font_title = cls._get_font(int(40 * font_scale))
-        font_small = cls._get_font(int(16 * font_scale))
+        small_size = _font_sizes(width).small
 
+        title_x = 180
         title_y = int(40 * font_scale)
-        draw_overlay = ImageDraw.Draw(overlay)
 
         # 绘制小鸟头像
-        bird_size = int(90 * font_scale)
-        bird_avatar = bird.resize((bird_size, bird_size))
-        mask = Image.new('L', (bird_size, bird_size), 0)
-        mask_draw = ImageDraw.Draw(mask)
-        mask_draw.ellipse([0, 0, bird_size, bird_size], fill=255)
-
-        bird_avatar_circle = Image.new('RGBA', (bird_size, bird_size), (0, 0, 0, 0))
-        bird_avatar_circle.paste(bird_avatar, (0, 0), mask)
-        del bird_avatar, mask, mask_draw
-
-        # 头像光晕
-        for r in range(int(55 * font_scale), 0, int(-8 * font_scale)):
-            alpha = int(100 * (r / 55))
-            draw_overlay.ellipse(
-                [int(70 * font_scale) - r, title_y - r,
-                 int(160 * font_scale) + r, title_y + bird_size + r],
-                fill=(180, 210, 255, alpha)
-            )
+        bird_avatar_circle = cls._get_bird_avatar(bird, int(90 * font_scale))
 
-        img.paste(overlay, (0, 0), overlay)
-        overlay = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        draw_overlay = ImageDraw.Draw(overlay)
+        # 头像光晕（预渲染的精灵图，每种缩放只绘制一次）
+        halo, halo_margin = _title_halo_sprite(font_scale)
+        img.paste(halo, (int(70 * font_scale) - halo_margin, title_y - halo_margin), halo)
 
         draw.ellipse([70, title_y, 160, title_y + 90], outline=(150, 200, 255), width=4)
         img.paste(bird_avatar_circle, (70, title_y), bird_avatar_circle)
 
-        # 绘制标题
-        title_x = 180
-        for offset in range(3, 0, -1):
-            shadow_color = (100 + offset * 20, 130 + offset * 25, 180 + offset * 20)
-            draw.text((title_x + offset, title_y + offset), title, fill=shadow_color, font=font_title)
-
-        draw.text((title_x, title_y), title, fill=(70, 120, 200), font=font_title)
-
         # 副标题
         subtitle = "冬日温暖时光~"
         subtitle_y = title_y + 75
-        subtitle_bbox = font_small.getbbox(subtitle)
-        subtitle_width = subtitle_bbox[2] - subtitle_bbox[0]
-        subtitle_height = subtitle_bbox[3] - subtitle_bbox[1]
+        subtitle_width, subtitle_height = _measure_text(small_size, subtitle)
 
         padding_x, padding_y = 5, 3
-        cls._draw_rounded_rectangle(
-            draw_overlay,
+        draw.rounded_rectangle(
             (title_x - padding_x, subtitle_y - padding_y,
              title_x + subtitle_width + padding_x, subtitle_y + subtitle_height + padding_y),
             radius=8,
             fill=(255, 255, 255, 180)
         )
-        img.paste(overlay, (0, 0), overlay)
-        overlay = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        draw_overlay = ImageDraw.Draw(overlay)
 
-        draw.text((title_x, subtitle_y), subtitle, fill=(120, 160, 220), font=font_small)
+        _draw_text(img, (title_x, subtitle_y), subtitle, (120, 160, 220), small_size)
 
         # 装饰线
         line_y = title_y + 95
@@ -495,224 +1041,217 @@ class ScheduleImageGenerator:
             draw.line([(80, line_y + i), (line_end_x, line_y + i)],
                      fill=(150, 190, 240, alpha), width=1)
 
-        return overlay
+    @classmethod
+    def _draw_title_area(
+        cls,
+        img: Any,
+        title: str,
+        width: int,
+        sizes: _FontSizes
+    ):
+        """绘制标题文字（带阴影）；头像、副标题等固定装饰已在基础画布中
+
+        Args:
+            img: 主图像
+            title: 标题文字
+            width: 画布宽度
+            sizes: 各级字号
+        """
+        title_size = sizes.title
+        title_x = 180
+        title_y = int(40 * (width / 1280))
+
+        for offset in range(3, 0, -1):
+            shadow_color = (100 + offset * 20, 130 + offset * 25, 180 + offset * 20)
+            _draw_text(img, (title_x + offset, title_y + offset), title, shadow_color, title_size)
+
+        _draw_text(img, (title_x, title_y), title, (70, 120, 200), title_size)
 
     @classmethod
     def _draw_schedule_cards(
         cls,
         img: Any,
-        draw: Any,
-        overlay: Any,
         display_items: List[Dict[str, Any]],
         display_target_index: int,
-        width: int,
-        height: int
-    ) -> Any:
+        display_statuses: List[str],
+        sizes: _FontSizes
+    ):
         """绘制日程卡片：遍历日程项，绘制卡片、图标、文字、状态
 
         Args:
             img: 主图像
-            draw: 绘制对象
-            overlay: overlay图像
             display_items: 要显示的日程项
             display_target_index: 高亮的目标索引
-            width: 画布宽度
-            height: 画布高度
-
-        Returns:
-            更新后的overlay对象
+            display_statuses: 各显示项的活动状态
+            sizes: 各级字号
         """
-        font_scale = width / 1280
-        font_title = cls._get_font(int(40 * font_scale))
-        font_text = cls._get_font(int(21 * font_scale))
-        font_time = cls._get_font(int(19 * font_scale))
-        font_small = cls._get_font(int(16 * font_scale))
+        title_size, text_size, time_size, small_size = sizes.title, sizes.text, sizes.time, sizes.small
 
-        y = 155
         card_spacing = 115
-
-        for item in display_items:
-            time_str = item.get("time", "")
-            name = item.get("name", "")
-            desc = item.get("description", "")
-            goal_type = item.get("goal_type", "custom")
-
-            icon = cls.TYPE_ICONS.get(goal_type, "◈")
-            item_index = display_items.index(item)
-            is_target = (item_index == display_target_index)
-
-            colors = [(150, 200, 255), (120, 180, 255), (180, 220, 255), (200, 180, 255), (220, 200, 255)]
-            color = colors[min(item_index, len(colors) - 1)]
-
-            card_x, card_width, card_height = 80, 830, 100
-
-            draw_overlay = ImageDraw.Draw(overlay)
-
-            # 目标高亮
-            if is_target:
-                for i in range(6):
-                    glow_offset = i * 10
-                    alpha = int(140 - i * 22)
-                    draw_overlay.rounded_rectangle(
-                        [card_x - glow_offset, y - glow_offset,
-                         card_x + card_width + glow_offset, y + card_height + glow_offset],
-                        radius=26,
-                        fill=(150, 220, 255, alpha)
-                    )
-
-            img.paste(overlay, (0, 0), overlay)
-            overlay = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-            draw_overlay = ImageDraw.Draw(overlay)
-
-            # 阴影
-            for i in range(3):
-                shadow_offset = 10 + i * 3
-                shadow_alpha = 80 - i * 20
-                cls._draw_rounded_rectangle(
-                    draw_overlay,
-                    (card_x + shadow_offset, y + shadow_offset,
-                     card_x + card_width + shadow_offset, y + card_height + shadow_offset),
-                    radius=26,
-                    fill=(180, 200, 220, shadow_alpha)
-                )
-
-            # 卡片背景
-            cls._draw_rounded_rectangle(
-                draw_overlay,
-                (card_x, y, card_x + card_width, y + card_height),
-                radius=26,
-                fill=(250, 252, 255, 250),
-                outline=color,
-                width=5 if is_target else 4
-            )
-
-            img.paste(overlay, (0, 0), overlay)
-            overlay = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-            draw_overlay = ImageDraw.Draw(overlay)
-
-            # 左侧渐变条
-            for i in range(18):
-                x_offset = card_x + i
-                gradient_ratio = i / 18
-                r = int(color[0] * (1 - gradient_ratio * 0.2))
-                g = int(color[1] * (1 - gradient_ratio * 0.2))
-                b = int(color[2] * (1 - gradient_ratio * 0.1))
-                draw.line([(x_offset, y + 26), (x_offset, y + card_height - 26)],
-                         fill=(r, g, b), width=1)
-
+        card_x, card_width, card_height = 80, 830, 100
+        time_x = card_x + 120
+        tag_offset_x = card_width - 140
+        # 名称位于状态标签左侧，描述位于标签下方可延伸到卡片右边缘
+        name_max_width = card_x + tag_offset_x - 10 - time_x
+        desc_max_width = card_x + card_width - 20 - time_x
+        colors = [(150, 200, 255), (120, 180, 255), (180, 220, 255), (200, 180, 255), (220, 200, 255)]
+
+        # 先把日程项转为按字段存放的并行列表，之后按图层（从下到上）分批绘制
+        count = len(display_items)
+        ys = [155 + card_spacing * index for index in range(count)]
+        times = [item.get("time", "") for item in display_items]
+        names = [_fit_text(text_size, item.get("name", ""), name_max_width) for item in display_items]
+        descs = [_fit_text(small_size, item.get("description", ""), desc_max_width) for item in display_items]
+        icons = [cls.TYPE_ICONS.get(item.get("goal_type", "custom"), "◈") for item in display_items]
+        card_colors = [colors[min(index, len(colors) - 1)] for index in range(count)]
+        status_styles = cls.STATUS_STYLES
+        tags = [status_styles[status] for status in display_statuses]
+
+        # 图层1：卡片底板（光晕、阴影、背景、左侧渐变条、装饰雪花），每张卡片预渲染为一个小图块粘贴一次；
+        # 目标卡片最先粘贴，使其光晕延伸到相邻卡片的部分被相邻卡片覆盖
+        for index in sorted(range(count), key=lambda i: i != display_target_index):
+            highlighted = index == display_target_index
+            tile, margin = _card_tile(card_width, card_height, card_colors[index], highlighted)
+            img.paste(tile, (card_x - margin, ys[index] - margin), tile)
+
+        # 主图像：图标、时间、名称、描述
+        for y, time_str, name, desc, icon, color in zip(ys, times, names, descs, icons, card_colors):
             # 图标
-            icon_x, icon_y = card_x + 40, y + 35
-            for i in range(2):
-                draw.text((icon_x + 3 - i, icon_y + 3 - i), icon,
-                         fill=(200, 210, 230), font=font_title)
-            draw.text((icon_x, icon_y), icon, fill=color, font=font_title)
+            _draw_shadowed_text(
+                img, (card_x + 40, y + 35), icon, color, (200, 210, 230), title_size, ((3, 3), (2, 2))
+            )
 
             # 时间
-            time_x = card_x + 120
-            for dx, dy in [(1, 0), (0, 1)]:
-                draw.text((time_x + dx, y + 20 + dy), time_str, fill=(130, 150, 180), font=font_time)
-            draw.text((time_x, y + 20), time_str, fill=(100, 130, 170), font=font_time)
+            _draw_shadowed_text(
+                img, (time_x, y + 20), time_str, (100, 130, 170), (130, 150, 180), time_size, ((1, 0), (0, 1))
+            )
 
             # 名称
-            name_y = y + 45
-            for dx, dy in [(1, 0), (0, 1), (1, 1)]:
-                draw.text((time_x + dx, name_y + dy), name, fill=(90, 120, 160), font=font_text)
-            draw.text((time_x, name_y), name, fill=(70, 100, 140), font=font_text)
+            _draw_shadowed_text(
+                img, (time_x, y + 45), name, (70, 100, 140), (90, 120, 160), text_size, ((1, 0), (0, 1), (1, 1))
+            )
 
             # 描述
-            draw.text((time_x, y + 72), desc, fill=(130, 150, 180), font=font_small)
-
-            # 状态标签
-            tag_x, tag_y = card_x + card_width - 140, y + 30
-            status = cls._get_activity_status(time_str)
-
-            if status == "current":
-                status_text, tag_color, tag_bg = "进行中", (100, 200, 255), (100, 200, 255, 240)
-            elif status == "completed":
-                status_text, tag_color, tag_bg = "已完成", (180, 220, 255), (180, 220, 255, 240)
-            else:
-                status_text, tag_color, tag_bg = "未开始", (200, 210, 255), (200, 210, 255, 240)
-
-            if is_target:
-                for i in range(4):
-                    glow_size = i * 6
-                    draw_overlay.ellipse(
-                        [tag_x - glow_size, tag_y - glow_size,
-                         tag_x + 100 + glow_size, tag_y + 40 + glow_size],
-                        fill=(*tag_color[:3], 60 - i * 14)
-                    )
-
-            draw_overlay.ellipse([tag_x, tag_y, tag_x + 100, tag_y + 40], fill=tag_bg)
-
-            img.paste(overlay, (0, 0), overlay)
-            overlay = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-            draw_overlay = ImageDraw.Draw(overlay)
-
-            for dx, dy in [(1, 0), (0, 1)]:
-                draw.text((tag_x + 20 + dx, tag_y + 10 + dy), status_text,
-                         fill=(255, 255, 255), font=font_small)
-            draw.text((tag_x + 20, tag_y + 10), status_text, fill=(255, 255, 255), font=font_small)
+            _draw_text(img, (time_x, y + 72), desc, (130, 150, 180), small_size)
 
-            # 装饰雪花
-            cls._draw_snowflake(draw_overlay, card_x + card_width - 35, y + 25, 8, (*color, 180))
-
-            img.paste(overlay, (0, 0), overlay)
-            overlay = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-
-            y += card_spacing
-
-        return overlay
+        # 图层2：状态标签（光晕、底色、文字），每种样式预渲染为一个小图块粘贴一次
+        tag_x = card_x + tag_offset_x
+        for index, (y, (status_text, tag_color, tag_bg)) in enumerate(zip(ys, tags)):
+            sprite, margin = _status_tag_sprite(
+                status_text, tag_color, tag_bg, index == display_target_index, small_size
+            )
+            img.paste(sprite, (tag_x - margin, y + 30 - margin), sprite)
 
     @classmethod
     def _add_signature(
         cls,
         img: Any,
         draw: Any,
-        overlay: Any,
         width: int,
-        height: int
+        height: int,
+        sizes: _FontSizes
     ):
         """添加底部签名
 
         Args:
             img: 主图像
-            draw: 绘制对象
-            overlay: overlay图像
+            draw: 绘制对象（RGBA模式）
             width: 画布宽度
             height: 画布高度
+            sizes: 各级字号
         """
-        font_small = cls._get_font(int(16 * (width / 1280)))
-        draw_overlay = ImageDraw.Draw(overlay)
+        small_size = sizes.small
 
         signature = "Powered by Mai-Bot"
         sig_x, sig_y = 10, height - 25
 
-        text_bbox = font_small.getbbox(signature)
-        text_width = text_bbox[2] - text_bbox[0]
-        text_height = text_bbox[3] - text_bbox[1]
+        text_width, text_height = _measure_text(small_size, signature)
 
         padding_x, padding_y = 5, 3
-        cls._draw_rounded_rectangle(
-            draw_overlay,
+        draw.rounded_rectangle(
             (sig_x - padding_x, sig_y - padding_y,
              sig_x + text_width + padding_x, sig_y + text_height + padding_y),
             radius=6,
             fill=(255, 255, 255, 180)
         )
-        img.paste(overlay, (0, 0), overlay)
-        draw.text((sig_x, sig_y), signature, fill=(120, 160, 220), font=font_small)
+        _draw_text(img, (sig_x, sig_y), signature, (120, 160, 220), small_size)
 
     # ========================================================================
     # 🆕 重构后的主函数 - 清晰的流程编排
     # ========================================================================
 
+    @classmethod
+    async def generate_schedule_image_async(
+        cls,
+        title: str,
+        schedule_items: List[Dict[str, Any]],
+        width: int = None,
+        quality: Optional[int] = None
+    ) -> ScheduleImageResult:
+        """异步生成日程图片：渲染与编码在线程中执行，不阻塞事件循环
+
+        并发数由异步信号量限制，超出的请求在事件循环中等待而不是阻塞工作线程。
+
+        Args:
+            title: 标题文字
+            schedule_items: 日程项列表
+            width: 图片宽度（None=使用默认1280）
+            quality: JPEG 质量（None=使用 JPEG_QUALITY）
+
+        Returns:
+            生成结果（同 generate_schedule_image）
+        """
+        async with cls._async_generation_semaphore:
+            return await asyncio.to_thread(
+                cls.generate_schedule_image, title, schedule_items, width, quality
+            )
+
+    @classmethod
+    def _result_cache_key(
+        cls,
+        title: str,
+        schedule_items: List[Dict[str, Any]],
+        width: Optional[int],
+        quality: Optional[int],
+        current_time_minutes: int
+    ) -> Optional[Tuple]:
+        """构建生成结果的缓存键：只包含绘制时用到的字段
+
+        Args:
+            title: 标题文字
+            schedule_items: 日程项列表
+            width: 图片宽度
+            quality: JPEG 质量
+            current_time_minutes: 当前时间（分钟数）
+
+        Returns:
+            缓存键；字段不可哈希时返回 None（不缓存）
+        """
+        key = (
+            title,
+            tuple(
+                (item.get("time", ""), item.get("name", ""),
+                 item.get("description", ""), item.get("goal_type", ""))
+                for item in schedule_items
+            ),
+            width,
+            quality,
+            current_time_minutes,
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
     @classmethod
     def generate_schedule_image(
         cls,
         title: str,
         schedule_items: List[Dict[str, Any]],
-        width: int = None
-    ) -> Tuple[str, str]:
+        width: int = None,
+        quality: Optional[int] = None
+    ) -> ScheduleImageResult:
         """生成日程图片（重构版：清晰的流程编排）
 
         遵循单一职责原则，将复杂的417行函数拆分为多个职责单一的私有方法。
@@ -722,53 +1261,70 @@ class ScheduleImageGenerator:
             title: 标题文字
             schedule_items: 日程项列表
             width: 图片宽度（None=使用默认1280）
+            quality: JPEG 质量（None=使用 JPEG_QUALITY）
 
         Returns:
-            (图片路径, base64编码字符串)
+            生成结果（可解包为 (图片路径, JPEG字节)，base64 按需编码）
         """
-        # 并发控制：最多3个并发生成
-        cls._generation_semaphore.acquire()
+        # 日程状态取决于当前时间，按分钟计入缓存键
+        now = TimezoneManager().get_now()
+        current_time_minutes = now.hour * 60 + now.minute
 
-        try:
+        cache_key = cls._result_cache_key(title, schedule_items, width, quality, current_time_minutes)
+        if cache_key is not None:
+            cached = cls._result_cache.get_sync(cache_key)
+            if cached is not None:
+                # 图片路径是共享的，期间可能被其他输入覆盖，命中时重新写入
+                cls.SCHEDULE_IMAGE_PATH.parent.mkdir(parents=True, exist_ok=True)
+                cls.SCHEDULE_IMAGE_PATH.write_bytes(cached.data)
+                return cached
+
+        # 并发控制：最多 GENERATION_PERMITS 个并发生成（with 块保证异常时也释放信号量）
+        with cls._generation_semaphore:
             # 1️⃣ 准备资源：验证参数、加载图片、计算尺寸
             width, height, bird, winter_char_alpha = cls._prepare_resources(width)
 
-            # 2️⃣ 创建基础画布：背景渐变、纹理、冬季角色、雪花
-            img, draw, overlay = cls._create_base_canvas(width, height, winter_char_alpha)
+            # 各绘制步骤共用的字号，只计算一次
+            sizes = _font_sizes(width)
+
+            # 2️⃣ 创建基础画布：背景渐变、纹理、冬季角色、雪花、标题区域装饰（按尺寸缓存）
+            img, draw = cls._create_base_canvas(width, height, bird, winter_char_alpha)
 
             # 3️⃣ 计算要显示的日程项：固定5个，当前/下一个在第3个位置
-            display_items, display_target_index = cls._calculate_display_items(schedule_items)
+            display_items, display_target_index, display_statuses = cls._calculate_display_items(
+                schedule_items, current_time_minutes
+            )
 
-            # 4️⃣ 绘制标题区域：头像、标题、副标题、装饰线
-            overlay = cls._draw_title_area(img, draw, overlay, title, width, height, bird)
+            # 4️⃣ 绘制标题文字（头像、副标题、装饰线已在基础画布中）
+            cls._draw_title_area(img, title, width, sizes)
 
             # 5️⃣ 绘制日程卡片：遍历日程项，绘制卡片、图标、文字、状态
             if display_items:
-                overlay = cls._draw_schedule_cards(
-                    img, draw, overlay, display_items,
-                    display_target_index, width, height
+                cls._draw_schedule_cards(
+                    img, display_items,
+                    display_target_index, display_statuses, sizes
                 )
 
             # 6️⃣ 添加底部签名
-            cls._add_signature(img, draw, overlay, width, height)
+            cls._add_signature(img, draw, width, height, sizes)
 
-            # 7️⃣ 保存并编码：确保目录存在，转换格式，保存文件，生成base64
+            # 7️⃣ 保存并编码：确保目录存在，保存文件
+            # （主图像本身就是RGB模式，半透明图形在绘制时已混合，可直接保存为JPEG）
             cls.SCHEDULE_IMAGE_PATH.parent.mkdir(parents=True, exist_ok=True)
 
-            # 转换为RGB格式（JPEG不支持透明度）
-            rgb_img = Image.new('RGB', img.size, (240, 245, 252))
-            rgb_img.paste(img, (0, 0))
-
-            # 保存为JPEG，质量85%（平衡清晰度和文件大小）
-            rgb_img.save(str(cls.SCHEDULE_IMAGE_PATH), format='JPEG', quality=85, optimize=True)
-
-            # 生成base64编码（用于发送）
+            # 只编码一次JPEG：同一份字节既写入文件，也随结果返回（base64 按需生成）
+            # 不启用 optimize（额外的霍夫曼表优化遍历耗时明显，文件仅小几个百分点）
+            if quality is None:
+                quality = cls.JPEG_QUALITY
             img_byte_arr = io.BytesIO()
-            rgb_img.save(img_byte_arr, format='JPEG', quality=85, optimize=True)
-            img_base64 = base64.b64encode(img_byte_arr.getvalue()).decode('utf-8')
-
-            return str(cls.SCHEDULE_IMAGE_PATH), img_base64
+            img.save(
+                img_byte_arr, format='JPEG', quality=quality,
+                optimize=False, subsampling=cls.JPEG_SUBSAMPLING, progressive=False
+            )
+            image_bytes = img_byte_arr.getvalue()
+            cls.SCHEDULE_IMAGE_PATH.write_bytes(image_bytes)
 
-        finally:
-            # 确保释放信号量（即使发生异常）
-            cls._generation_semaphore.release()
+            result = ScheduleImageResult(str(cls.SCHEDULE_IMAGE_PATH), image_bytes)
+            if cache_key is not None:
+                cls._result_cache.set_sync(cache_key, result)
+            return result
@@ -16,8 +16,23 @@ Example:
     09:00 - 17:00
 """
 
+import logging
+import re
+from functools import lru_cache
 from typing import Any, List, Optional, Tuple, Union
 
+logger = logging.getLogger("autonomous_planning")
+
+# 0-2880 分钟对应的 HH:MM 字符串（查表代替格式化）；
+# 跨夜窗口的结束时间最多到次日24:00（2880），同样直接查表
+_MINUTE_STRINGS: Tuple[str, ...] = tuple(f"{m // 60:02d}:{m % 60:02d}" for m in range(2881))
+
+# 非标准宽度的时间字符串：H:MM / HH:M、只有小时的 "HH"、带秒的 "HH:MM:SS"（秒忽略）
+_TIME_SLOT_PATTERN = re.compile(r"([0-9]{1,2})(?::([0-9]{1,2}))?(?::[0-9]{1,2})?")
+
+# 无效输入时返回的共享 (None, None)，调用方可用 `is _NONE_PAIR` 判断
+_NONE_PAIR: Tuple[None, None] = (None, None)
+
 
 def migrate_time_window(time_window: Optional[List[Union[int, float]]]) -> Optional[List[int]]:
     """
@@ -41,8 +56,6 @@ def migrate_time_window(time_window: Optional[List[Union[int, float]]]) -> Optio
 
     # 检测无效时间窗口（起止时间相同）
     if start == end:
-        import logging
-        logger = logging.getLogger("autonomous_planning")
         logger.warning(f"无效的时间窗口: {time_window} (起止时间相同)")
         return None
 
@@ -72,9 +85,15 @@ def parse_time_window(time_window: Optional[List[Union[int, float]]]) -> Tuple[O
     Returns:
         (start_minutes, end_minutes) 或 (None, None)
     """
+    # 快速路径：已是新格式（分钟）的两元素列表，无需迁移
+    if time_window.__class__ is list and len(time_window) == 2:
+        start, end = time_window
+        if start != end and (start >= 24 or end > 24):
+            return start, end
+
     migrated = migrate_time_window(time_window)
     if not migrated:
-        return None, None
+        return _NONE_PAIR
     return migrated[0], migrated[1]
 
 
@@ -89,7 +108,13 @@ def parse_time_slot(time_slot: str) -> Tuple[Optional[int], Optional[int]]:
         (hour, minute) 或 (None, None)
     """
     if not time_slot or not isinstance(time_slot, str):
-        return None, None
+        return _NONE_PAIR
+
+    # 标准 "HH:MM" 直接按位计算，省去 split 与 int 解析
+    if len(time_slot) == 5 and time_slot[2] == ":":
+        a, b, c, d = time_slot[0], time_slot[1], time_slot[3], time_slot[4]
+        if "0" <= a <= "9" and "0" <= b <= "9" and "0" <= c <= "9" and "0" <= d <= "9":
+            return (ord(a) - 48) * 10 + (ord(b) - 48), (ord(c) - 48) * 10 + (ord(d) - 48)
 
     try:
         parts = time_slot.split(":")
@@ -97,23 +122,43 @@ def parse_time_slot(time_slot: str) -> Tuple[Optional[int], Optional[int]]:
         minute = int(parts[1]) if len(parts) > 1 else 0
         return hour, minute
     except (ValueError, IndexError):
-        return None, None
+        return _NONE_PAIR
 
 
 def time_slot_to_minutes(time_slot: str) -> Optional[int]:
     """
     将 HH:MM 格式时间转换为从00:00开始的分钟数
 
+    一天内不同的时间字符串最多只有1440种，结果按字符串缓存。
+
     Args:
         time_slot: 时间字符串，如 "09:30"
 
     Returns:
         分钟数（如 570 表示 09:30）或 None
     """
-    hour, minute = parse_time_slot(time_slot)
-    if hour is None:
+    # 非字符串（可能不可哈希）不进入缓存
+    if not isinstance(time_slot, str):
+        return None
+    return _time_slot_to_minutes_cached(time_slot)
+
+
+@lru_cache(maxsize=2048)
+def _time_slot_to_minutes_cached(time_slot: str) -> Optional[int]:
+    """time_slot_to_minutes 的缓存实现（仅接受字符串）"""
+    # 标准 "HH:MM" 直接按位计算，省去 split 与 int 解析
+    if len(time_slot) == 5 and time_slot[2] == ":":
+        a, b, c, d = time_slot[0], time_slot[1], time_slot[3], time_slot[4]
+        if "0" <= a <= "9" and "0" <= b <= "9" and "0" <= c <= "9" and "0" <= d <= "9":
+            return (ord(a) - 48) * 600 + (ord(b) - 48) * 60 + (ord(c) - 48) * 10 + (ord(d) - 48)
+
+    # 其他形式用预编译正则匹配（与 parse_time_slot 一致：缺省分钟为0，秒忽略，
+    # 首尾空白忽略），缺少冒号的 "0930" 等直接返回 None
+    match = _TIME_SLOT_PATTERN.fullmatch(time_slot.strip())
+    if match is None:
         return None
-    return hour * 60 + minute
+    hour, minute = match.groups()
+    return int(hour) * 60 + (int(minute) if minute else 0)
 
 
 def format_minutes_to_time(minutes: int) -> str:
@@ -126,11 +171,36 @@ def format_minutes_to_time(minutes: int) -> str:
     Returns:
         格式化的时间字符串，如 "09:30"
     """
-    hour = minutes // 60
-    minute = minutes % 60
+    if 0 <= minutes <= 2880:
+        return _MINUTE_STRINGS[minutes]
+
+    # 超出表的范围时保持原有格式化行为
+    hour, minute = divmod(minutes, 60)
     return f"{hour:02d}:{minute:02d}"
 
 
+def get_goal_time_window(goal: Any) -> Optional[List[Union[int, float]]]:
+    """
+    获取目标的原始 time_window（不做格式解析）
+
+    优先从 parameters 读取，其次从 conditions 读取；使用 .get 单次查找，
+    避免 `in` + `[]` 的重复查找。
+
+    Args:
+        goal: 目标对象
+
+    Returns:
+        原始时间窗口，不存在时返回 None
+    """
+    parameters = getattr(goal, 'parameters', None)
+    if parameters:
+        time_window = parameters.get("time_window")
+        if time_window is not None:
+            return time_window
+    conditions = getattr(goal, 'conditions', None)
+    return conditions.get("time_window") if conditions else None
+
+
 def get_time_window_from_goal(goal: Any) -> Tuple[int, int]:
     """
     从目标对象中提取时间窗口（统一接口）
@@ -144,12 +214,7 @@ def get_time_window_from_goal(goal: Any) -> Tuple[int, int]:
         (start_minutes, end_minutes) 元组，默认返回 (0, 60)
     """
     # 优先从parameters读取time_window，其次从conditions读取
-    time_window = None
-    if hasattr(goal, 'parameters') and goal.parameters and "time_window" in goal.parameters:
-        time_window = goal.parameters.get("time_window")
-    elif hasattr(goal, 'conditions') and goal.conditions and "time_window" in goal.conditions:
-        time_window = goal.conditions.get("time_window")
-
+    time_window = get_goal_time_window(goal)
     if not time_window:
         return (0, 60)
 
@@ -5,12 +5,51 @@ eliminating code duplication across multiple modules.
 """
 
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from typing import Dict, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+try:
+    import pytz  # 可选依赖：系统缺少时区数据时的后备
+except ImportError:
+    pytz = None
 
 from src.common.logger import get_logger
 
 logger = get_logger("autonomous_planning.timezone_manager")
 
+# 默认时区（未配置时区时使用）
+DEFAULT_TIMEZONE = "Asia/Shanghai"
+
+
+@lru_cache(maxsize=32)
+def _load_timezone(timezone_str: str):
+    """按时区字符串加载时区对象（进程内缓存）
+
+    优先使用标准库 zoneinfo（datetime.now(tz) 比 pytz 更快）；系统缺少时区数据
+    （如 Windows 未安装 tzdata）时再尝试 pytz。时区对象不可变，可在所有
+    TimezoneManager 实例间共享。加载失败的结果同样被缓存，警告只记录一次。
+
+    Args:
+        timezone_str: 时区字符串
+
+    Returns:
+        时区对象（ZoneInfo 或 pytz 时区），如果初始化失败则返回None
+    """
+    try:
+        return ZoneInfo(timezone_str)
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        zoneinfo_error = e
+
+    if pytz is None:
+        logger.warning(f"时区初始化失败: {zoneinfo_error}，将使用系统时区")
+        return None
+    try:
+        return pytz.timezone(timezone_str)
+    except Exception as e:
+        logger.warning(f"时区初始化失败: {e}，将使用系统时区")
+        return None
+
 
 class TimezoneManager:
     """时区管理器 - 集中管理时区处理，避免重复代码
@@ -26,30 +65,41 @@ class TimezoneManager:
         >>> print(now.strftime("%Y-%m-%d %H:%M:%S"))
     """
 
-    def __init__(self, timezone_str: str = "Asia/Shanghai"):
-        """初始化时区管理器
+    # 按时区字符串共享的实例：同一时区重复构造时直接返回已有实例
+    _instances: Dict[str, "TimezoneManager"] = {}
+
+    def __new__(cls, timezone_str: str = DEFAULT_TIMEZONE):
+        # 非字符串（可能不可哈希）不共享实例
+        if not isinstance(timezone_str, str):
+            return super().__new__(cls)
+        instance = cls._instances.get(timezone_str)
+        if instance is None:
+            instance = cls._instances.setdefault(timezone_str, super().__new__(cls))
+        return instance
+
+    def __init__(self, timezone_str: str = DEFAULT_TIMEZONE):
+        """初始化时区管理器（共享实例只初始化一次）
 
         Args:
             timezone_str: 时区字符串（如 "Asia/Shanghai", "UTC" 等）
         """
+        if getattr(self, "_initialized", False):
+            return
         self.timezone_str = timezone_str
         self._tz = self._init_timezone()
+        self._initialized = True
 
     def _init_timezone(self):
         """初始化时区对象
 
         Returns:
-            pytz时区对象，如果初始化失败则返回None
+            时区对象，如果初始化失败则返回None
         """
-        try:
-            import pytz
-            return pytz.timezone(self.timezone_str)
-        except ImportError:
-            logger.warning("pytz模块未安装，将使用系统时区")
-            return None
-        except Exception as e:
-            logger.warning(f"时区初始化失败: {e}，将使用系统时区")
+        # 非字符串（可能不可哈希）不进入缓存
+        if not isinstance(self.timezone_str, str):
+            logger.warning(f"时区初始化失败: 无效的时区 {self.timezone_str!r}，将使用系统时区")
             return None
+        return _load_timezone(self.timezone_str)
 
     def get_now(self) -> datetime:
         """获取当前时间（配置时区）
@@ -63,3 +113,7 @@ class TimezoneManager:
         if self._tz:
             return datetime.now(self._tz)
         return datetime.now()
+
+
+# 导入时预先加载默认时区，首次获取当前时间时不再读取时区数据文件
+_load_timezone(DEFAULT_TIMEZONE)